@@ -1,26 +1,41 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 
-from .base import BaseData
+from .base import BaseData, lazy_attribute
 
 if TYPE_CHECKING:
 	from ..client import Client
 
 class BaseAsset(BaseData):
+	__slots__ = ()
+	
 	def __init__(self, client: Client, id: int) -> None:
 		super().__init__(client, id)
 
 class Asset(BaseAsset):
+	__slots__ = ('raw',)
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		self.id = data.get('assetId')
 		
 		super().__init__(client, self.id)
 		
-		self.created = parse(data['created']).timestamp()
-		self.updated = parse(data['updated']).timestamp()
+		self.raw = data
 		
+		self._hydrate()
+	
+	@lazy_attribute
+	def created(self):
+		return parse_timestamp(self.raw['created'])
+	
+	@lazy_attribute
+	def updated(self):
+		return parse_timestamp(self.raw['updated'])
+	
+	@lazy_attribute
+	def owner(self):
 		from ..classes.users import PartialUser
 		
-		self.owner = PartialUser(client, data['owner'])
\ No newline at end of file
+		return PartialUser(self.client, self.raw['owner'])
\ No newline at end of file
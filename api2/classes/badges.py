@@ -1,9 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 
-from .base import BaseData
+from .base import BaseData, lazy_attribute
 from ..classes.universes import PartialUniverse
 from ..classes.places import BasePlace
 
@@ -11,14 +11,18 @@ if TYPE_CHECKING:
 	from ..client import Client
 
 class BadgeStatistics:
+	__slots__ = ('past_day_awarded_count', 'awarded_count', 'win_rate_percentage')
+	
 	def __init__(self, statistic_data: dict) -> None:
 		self.past_day_awarded_count = statistic_data.get('pastDayAwardedCount')
 		self.awarded_count = statistic_data.get('awardedCount')
 		self.win_rate_percentage = statistic_data.get('winRatePercentage')
 
 class BaseBadge(BaseData):
+	__slots__ = ()
+	
 	def get_icon(self, is_circular: bool = False):
-		return self.client.thumbnails.get_badge_icons([self.id], is_circular=is_circular)[0]
+		return self.client.thumbnails.get_badge_icon(self.id, is_circular=is_circular)
 	
 	@property
 	def link(self):
@@ -28,31 +32,52 @@ class BaseBadge(BaseData):
 		return f'<{self.__class__.__name__}: {self.id}>'
 
 class PartialBadge(BaseBadge):
+	__slots__ = ('raw',)
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		super().__init__(client, data['id'])
 		
 		self.raw = data
 		
-		self.name = data['name']
-		self.description = data['description']
-		self.enabled = data['enabled']
-		
-		self.created = parse(data['created']).timestamp()
-		self.updated = parse(data['updated']).timestamp()
-		
-		self.statistics = BadgeStatistics(data['statistics'])
+		self._hydrate()
+	
+	@lazy_attribute
+	def name(self):
+		return self.raw['name']
+	
+	@lazy_attribute
+	def description(self):
+		return self.raw['description']
+	
+	@lazy_attribute
+	def enabled(self):
+		return self.raw['enabled']
+	
+	@lazy_attribute
+	def created(self):
+		return parse_timestamp(self.raw['created'])
+	
+	@lazy_attribute
+	def updated(self):
+		return parse_timestamp(self.raw['updated'])
+	
+	@lazy_attribute
+	def statistics(self):
+		return BadgeStatistics(self.raw['statistics'])
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.name}>'
 
 class UserBadge(PartialBadge):
-	def __init__(self, client: Client, data: dict) -> None:
-		super().__init__(client, data)
-		
-		self.awarder = BasePlace(client=client, id=data['awarder']['id'])
+	__slots__ = ()
+	
+	@lazy_attribute
+	def awarder(self):
+		return BasePlace(client=self.client, id=self.raw['awarder']['id'])
 
 class Badge(PartialBadge):
-	def __init__(self, client: Client, data: dict) -> None:
-		super().__init__(client, data)
-		
-		self.awarding_universe = PartialUniverse(client=client, data=data['awardingUniverse'])
\ No newline at end of file
+	__slots__ = ()
+	
+	@lazy_attribute
+	def awarding_universe(self):
+		return PartialUniverse(client=self.client, data=self.raw['awardingUniverse'])
\ No newline at end of file
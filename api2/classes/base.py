@@ -1,11 +1,73 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
 	from ..client import Client
 
-class BaseData:
-	id = None
+class lazy_attribute:
+	# works out an attribute from the model's raw data the first time it gets read,
+	# the value lives in a slot named after the attribute with an underscore in front
+	def __init__(self, func: Callable[[Any], Any]) -> None:
+		self.func = func
+		self.name = func.__name__
+		self.slot_name = f'_{self.name}'
+	
+	def __get__(self, instance: Any, owner: type = None):
+		if instance is None:
+			return self
+		
+		try:
+			return getattr(instance, self.slot_name)
+		except AttributeError:
+			value = self.func(instance)
+			setattr(instance, self.slot_name, value)
+			
+			return value
+	
+	def __set__(self, instance: Any, value: Any):
+		setattr(instance, self.slot_name, value)
+	
+	def __delete__(self, instance: Any):
+		try:
+			delattr(instance, self.slot_name)
+		except AttributeError:
+			pass
+
+class ModelMeta(type):
+	# a lazy attribute can't share its name with a slot, so give each one its own backing slot
+	def __new__(mcs, name: str, bases: tuple, namespace: dict, **kwargs):
+		if '__slots__' in namespace:
+			slots = namespace['__slots__']
+			slots = (slots,) if isinstance(slots, str) else tuple(slots)
+			
+			namespace['__slots__'] = slots + tuple(
+				value.slot_name
+				for value in namespace.values()
+				if isinstance(value, lazy_attribute)
+			)
+		
+		return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+_lazy_attributes: dict[type, tuple[lazy_attribute]] = {}
+
+def get_lazy_attributes(cls: type) -> tuple[lazy_attribute]:
+	attributes = _lazy_attributes.get(cls)
+	
+	if attributes is None:
+		attributes = _lazy_attributes[cls] = tuple({
+			name: value
+			for klass in reversed(cls.__mro__)
+			for name, value in vars(klass).items()
+			if isinstance(value, lazy_attribute)
+		}.values())
+	
+	return attributes
+
+class BaseData(metaclass=ModelMeta):
+	__slots__ = ('client', 'id')
+	
+	# attributes holding response data that only the lazy attributes need
+	raw_attributes = ('raw',)
 	
 	def __init__(self, client: Client, id: int) -> None:
 		if not id:
@@ -14,6 +76,26 @@ class BaseData:
 		self.client = client
 		self.id = id
 	
+	def _hydrate(self):
+		# works everything out straight away unless the client wants lazy models
+		config = self.client.config
+		
+		# lazy attributes need the raw data, so dropping it means working everything out now
+		if config.lazy_models and config.keep_raw:
+			return
+		
+		for attribute in get_lazy_attributes(self.__class__):
+			setattr(self, attribute.slot_name, attribute.func(self))
+		
+		if not config.keep_raw:
+			for name in self.raw_attributes:
+				setattr(self, name, None)
+	
+	def _clear_lazy_attributes(self):
+		# has to happen before re-initialising, or lazy models would keep values from the old raw data
+		for attribute in get_lazy_attributes(self.__class__):
+			attribute.__delete__(self)
+	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}>'
 	
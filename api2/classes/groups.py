@@ -3,38 +3,53 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 from ..utility.fetcher import PageIterator
 
-from .base import BaseData
+from .base import BaseData, lazy_attribute
 from .users import User, PartialUser
 
 if TYPE_CHECKING:
 	from ..client import Client
 
 class GroupShout:
+	__slots__ = ('body', 'poster', 'created', 'updated')
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		self.body = data.get('body')
 		
 		self.poster = PartialUser(client, data.get('poster'))
 		
-		self.created = parse(data.get('created')).timestamp()
-		self.updated = parse(data.get('updated')).timestamp()
+		self.created = parse_timestamp(data.get('created'))
+		self.updated = parse_timestamp(data.get('updated'))
 
 class GroupRole:
+	__slots__ = ('id', 'name', 'rank')
+	
 	def __init__(self, data: dict) -> None:
 		self.id = data.get('id')
 		self.name = data.get('name')
 		self.rank = data.get('rank')
 
 class GroupMember(User):
+	__slots__ = ('group', 'role_raw')
+	
+	raw_attributes = ('raw', 'role_raw')
+	
 	def __init__(self, client: Client, data: dict, group: Group):
-		super().__init__(client, data['user'])
-		
+		# the role has to be kept around before hydrating, raw only holds the user
+		self.role_raw = data['role']
 		self.group = group
-		self.role = GroupRole(data['role'])
+		
+		super().__init__(client, data['user'])
+	
+	@lazy_attribute
+	def role(self):
+		return GroupRole(self.role_raw)
 
 class BaseGroup(BaseData):
+	__slots__ = ()
+	
 	def get_members(self, page_size: int = 10):
 		return PageIterator(
 			fetcher=self.client.fetcher,
@@ -47,6 +62,8 @@ class BaseGroup(BaseData):
 		return f'<{self.__class__.__name__}: {self.id}>'
 
 class Group(BaseGroup):
+	__slots__ = ('raw', 'name', 'description', 'member_count', 'public_entry_allowed', 'is_locked', 'owner')
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		super().__init__(client, data['id'])
 		
@@ -60,6 +77,8 @@ class Group(BaseGroup):
 		self.is_locked = data.get('isLocked', False)
 		
 		self.owner = PartialUser(client, data.get('owner')) if data.get('owner') else None
+		
+		self._hydrate()
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.name}>'
\ No newline at end of file
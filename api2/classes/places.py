@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 	from ..client import Client
 
 class GameInstance(BaseData):
+	__slots__ = ('job_id', 'max_players', 'playing', 'fps', 'ping', 'player')
+	
 	def __init__(self, data: dict) -> None:
 		self.job_id = data.get('id')
 		
@@ -24,6 +26,8 @@ class GameInstance(BaseData):
 		return f'<{self.__class__.__name__} id={self.job_id!r}>'
 
 class BasePlace(BaseData):
+	__slots__ = ()
+	
 	def get_instances(self, page_size: int = 10):
 		return PageIterator(
 			fetcher=self.client.fetcher,
@@ -33,7 +37,7 @@ class BasePlace(BaseData):
 		)
 	
 	def get_icon(self, size: PlaceThumbnailSize = PlaceThumbnailSize.Medium, is_circular: bool = False):
-		return self.client.thumbnails.get_places_icons([self.id], size=size, is_circular=is_circular)[0]
+		return self.client.thumbnails.get_place_icon(self.id, size=size, is_circular=is_circular)
 	
 	@property
 	def link(self):
@@ -43,6 +47,8 @@ class BasePlace(BaseData):
 		return f'<{self.__class__.__name__}: {self.id}>'
 
 class Place(BasePlace):
+	__slots__ = ('raw', 'name', 'description', 'is_playable', 'reason_prohibited', 'price', 'universe_id', 'builder', 'builderId')
+	
 	def __init__(self, client: Client, data: dict):
 		super().__init__(client, data['placeId'])
 		
@@ -59,6 +65,8 @@ class Place(BasePlace):
 		
 		self.builder = data.get('builder')
 		self.builderId = data.get('builderId')
+		
+		self._hydrate()
 	
 	def get_Universe(self):
 		client = self.client
@@ -1,22 +1,25 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 
-from .base import BaseData
+from .base import BaseData, lazy_attribute
 from .places import BasePlace
 from ..utility.fetcher import PageIterator
+from ..utility.awaitables import chain
 from ..enums import UniverseThumbnailSize
 
 if TYPE_CHECKING:
 	from ..client import Client
 
 class BaseUniverse(BaseData):
+	__slots__ = ()
+	
 	def get_thumbnail_container(self, size: UniverseThumbnailSize = UniverseThumbnailSize.Medium, count: int = 1, is_circular: bool = False):
-		return self.client.thumbnails.get_universe_thumbnails([self.id], size=size, count_per_universe=count, is_circular=is_circular)[0]
+		return chain(lambda containers: containers[0], self.client.thumbnails.get_universe_thumbnails([self.id], size=size, count_per_universe=count, is_circular=is_circular))
 	
 	def get_thumbnails(self, size: UniverseThumbnailSize = UniverseThumbnailSize.Medium, count: int = 1, is_circular: bool = False):
-		return self.get_thumbnail_container(size=size, count=count, is_circular=is_circular).thumbnails
+		return chain(lambda container: container.thumbnails, self.get_thumbnail_container(size=size, count=count, is_circular=is_circular))
 	
 	def get_badges(self, page_size: int = 10):
 		from .badges import Badge
@@ -34,11 +37,22 @@ class BaseUniverse(BaseData):
 		return f'<{self.__class__.__name__}: {self.id}>'
 
 class PartialUniverse(BaseUniverse):
+	__slots__ = ('raw',)
+	
 	def __init__(self, client: Client, data: dict):
 		super().__init__(client, data['id'])
 		
-		self.name = data.get('name')
+		self.raw = data
 		
+		self._hydrate()
+	
+	@lazy_attribute
+	def name(self):
+		return self.raw.get('name')
+	
+	@lazy_attribute
+	def root_place(self):
+		data = self.raw
 		place_id = None
 		
 		if data.get('rootPlace'):
@@ -46,53 +60,81 @@ class PartialUniverse(BaseUniverse):
 		else:
 			place_id = data.get('rootPlaceId')
 		
-		self.root_place = BasePlace(client, place_id)
+		return BasePlace(self.client, place_id)
 	
 	@property
 	def link(self):
 		return self.root_place.link
 
 class Universe(PartialUniverse):
-	def __init__(self, client: Client, data: dict):
-		super().__init__(client, data)
-		
-		self.raw = data
-		
-		self.description = data.get('description')
-		
-		self.playing = data.get('playing')
-		self.visits = data.get('visits')
-		self.max_players = data.get('maxPlayers')
-		
-		self.is_favorited = data.get('isFavoritedByUser')
-		self.favorited_count = data.get('favoritedCount')
-		
-		self.is_genre_enforced = data.get('isGenreEnforced')
-		self.genre = data.get('genre')
-		self.price = data.get('price')
-		self.copying_allowed = data.get('copyingAllowed')
+	__slots__ = ()
+	
+	@lazy_attribute
+	def description(self):
+		return self.raw.get('description')
+	
+	@lazy_attribute
+	def playing(self):
+		return self.raw.get('playing')
+	
+	@lazy_attribute
+	def visits(self):
+		return self.raw.get('visits')
+	
+	@lazy_attribute
+	def max_players(self):
+		return self.raw.get('maxPlayers')
+	
+	@lazy_attribute
+	def is_favorited(self):
+		return self.raw.get('isFavoritedByUser')
+	
+	@lazy_attribute
+	def favorited_count(self):
+		return self.raw.get('favoritedCount')
+	
+	@lazy_attribute
+	def is_genre_enforced(self):
+		return self.raw.get('isGenreEnforced')
+	
+	@lazy_attribute
+	def genre(self):
+		return self.raw.get('genre')
+	
+	@lazy_attribute
+	def price(self):
+		return self.raw.get('price')
+	
+	@lazy_attribute
+	def copying_allowed(self):
+		return self.raw.get('copyingAllowed')
+	
+	@lazy_attribute
+	def created(self):
+		return parse_timestamp(self.raw.get('created'))
+	
+	@lazy_attribute
+	def updated(self):
+		return parse_timestamp(self.raw.get('updated'))
+	
+	@lazy_attribute
+	def creator(self):
+		creator_data = self.raw.get('creator')
 		
-		self.created = parse(data.get('created')).timestamp()
-		self.updated = parse(data.get('updated')).timestamp()
+		if not creator_data:
+			return
 		
-		creator_data = data.get('creator')
+		creator_type = creator_data.get('type')
+		creator_id = creator_data.get('id')
 		
-		if creator_data:
-			creator_type = creator_data.get('type')
-			creator_id = creator_data.get('id')
-			
-			new_creator = None
+		if creator_type == 'User':
+			from .users import BaseUser
 			
-			if creator_type == 'User':
-				from .users import BaseUser
-				
-				new_creator = BaseUser(client, creator_id)
-			elif creator_type == 'Group':
-				from .groups import BaseGroup
-				
-				new_creator = BaseGroup(client, creator_id)
+			return BaseUser(self.client, creator_id)
+		elif creator_type == 'Group':
+			from .groups import BaseGroup
 			
-			self.creator = new_creator
+			return BaseGroup(self.client, creator_id)
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.name}>'
\ No newline at end of file
@@ -4,18 +4,21 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 
-from .base import BaseData
+from .base import BaseData, lazy_attribute
 from .badges import UserBadge
 from ..enums import AssetType, UserThumbnailSize, UserThumbnailType, OutfitType
 from ..utility.fetcher import PageIterator, SortOrder
+from ..utility.awaitables import chain, resolved
 
 if TYPE_CHECKING:
 	from ..client import Client
 	from ..types import UserOrId
 
 class FriendRequest(BaseData):
+	__slots__ = ('source_universe_id', 'origin_source_type', 'contact_name', 'sent_at', 'origin_user')
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		friend_request_data = data['friendRequest']
 		
@@ -25,66 +28,75 @@ class FriendRequest(BaseData):
 		self.source_universe_id = friend_request_data.get('sourceUniverseId')
 		self.origin_source_type = friend_request_data.get('originSourceType')
 		self.contact_name = friend_request_data.get('contactName')
-		self.sent_at = parse(friend_request_data['sentAt']).timestamp()
+		self.sent_at = parse_timestamp(friend_request_data['sentAt'])
 		
 		self.origin_user = User(client, data) # why does friend request contain the same information as a user who knows
 	
 	def accept(self):
 		client = self.client
-		client.fetcher.post(
+		
+		return chain(lambda _: None, client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{self.id}/accept-friend-request')
-		)
+		))
 	
 	def decline(self):
 		client = self.client
-		client.fetcher.post(
+		
+		return chain(lambda _: None, client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{self.id}/decline-friend-request')
-		)
+		))
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.origin_user.fullname}>'
 
 class BaseUser(BaseData):
+	__slots__ = ()
+	
 	def get_presence(self):
-		presences = self.client.presence.get_user_presences([self.id])
-		
-		try:
-			return presences[0]
-		except IndexError:
-			return None
+		return self.client.presence.get_user_presence(self.id)
 	
 	
 	def get_friends(self) -> list[Friend]:
 		client = self.client
 		
-		friends_json, _ = client.fetcher.get(
-			url=client.url_generator.get_url('friends', f'v1/users/{self.id}/friends')
-		)
-		
-		friends_data = None
-		
-		try:
-			friends_data = friends_json['data']
-		except:
-			friends_data = []
+		def handle(result):
+			friends_json, _ = result
+			friends_data = None
+			
+			try:
+				friends_data = friends_json['data']
+			except:
+				friends_data = []
+			
+			friends = [Friend(client, data) for data in friends_data]
+			
+			client.set_cache('friends', self.id, friends)
+			
+			return friends
 		
-		return [Friend(client, data) for data in friends_data]
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('friends', f'v1/users/{self.id}/friends')
+		))
 	
 	def get_mutuals_with(self, other: UserOrId):
-		if isinstance(other, int):
-			other = BaseUser(self.client, other)
+		client = self.client
 		
-		mutuals = []
+		if isinstance(other, int):
+			other = BaseUser(client, other)
 		
-		friends = self.get_friends()
-		other_friends = other.get_friends()
+		def handle(friends, other_friends):
+			other_ids = {friend.id for friend in other_friends}
+			
+			return [friend for friend in friends if friend.id in other_ids]
 		
-		mutuals = [friend if friend in other_friends else None for friend in friends]
+		# both friends lists fetched recently enough are answered from the cache without any requests
+		friends = client.get_cache('friends', self.id)
+		other_friends = client.get_cache('friends', other.id)
 		
-		for _ in range(mutuals.count(None)):
-			mutuals.remove(None)
+		if friends is not None and other_friends is not None:
+			return resolved(client.fetcher, handle(friends, other_friends))
 		
-		return mutuals
+		return chain(handle, self.get_friends(), other.get_friends())
 	
 	
 	def get_currency(self):
@@ -94,7 +106,7 @@ class BaseUser(BaseData):
 	def get_badge_award_date(self, badge_id: int):
 		client = self.client
 		
-		return client.users.get_badge_awarded_dates(self.id, [badge_id])[0]
+		return chain(lambda dates: dates[0], client.users.get_badge_awarded_dates(self.id, [badge_id]))
 	
 	def get_badges(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Descending):
 		client = self.client
@@ -132,7 +144,7 @@ class BaseUser(BaseData):
 	
 	
 	def get_thumbnail(self, type: UserThumbnailType = UserThumbnailType.Bust, size: UserThumbnailSize = UserThumbnailSize.Medium, is_circular: bool = False):
-		return self.client.thumbnails.get_user_thumbnails([self.id], type=type, size=size, is_circular=is_circular)[0]
+		return self.client.thumbnails.get_user_thumbnail(self.id, type=type, size=size, is_circular=is_circular)
 	
 	
 	def get_outfits(self, outfit_type: OutfitType = OutfitType.Avatar, page_size: int = 25, is_editable: bool = True):
@@ -163,13 +175,22 @@ class BaseUser(BaseData):
 
 
 class PartialUser(BaseUser):
+	__slots__ = ('raw',)
+	
 	def __init__(self, client: Client, data: dict):
 		super().__init__(client, data.get('userId', data.get('id')))
 		
 		self.raw = data
 		
-		self.name = data.get('username', data.get('name'))
-		self.display_name = data.get('displayName')
+		self._hydrate()
+	
+	@lazy_attribute
+	def name(self):
+		return self.raw.get('username', self.raw.get('name'))
+	
+	@lazy_attribute
+	def display_name(self):
+		return self.raw.get('displayName')
 	
 	@property
 	def fullname(self):
@@ -179,46 +200,57 @@ class PartialUser(BaseUser):
 		return f'<{self.__class__.__name__}: {self.fullname}>'
 
 class User(PartialUser):
-	def __init__(self, client: Client, data: dict):
-		super().__init__(client, data)
-		
-		self.description = data.get('description')
-		
-		self.is_banned = data.get('isBanned')
-		self.has_verified_badge = data.get('hasVerifiedBadge')
+	__slots__ = ()
+	
+	@lazy_attribute
+	def description(self):
+		return self.raw.get('description')
+	
+	@lazy_attribute
+	def is_banned(self):
+		return self.raw.get('isBanned')
+	
+	@lazy_attribute
+	def has_verified_badge(self):
+		return self.raw.get('hasVerifiedBadge')
+	
+	@lazy_attribute
+	def created(self):
+		created = self.raw.get('created')
 		
-		if data.get('created'):
-			self.created = parse(data.get('created')).timestamp()
+		return parse_timestamp(created) if created else None
 	
 	def update_info(self):
 		client = self.client
 		
-		user_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('users', f'v1/users/{self.id}')
-		)
+		def handle(result):
+			user_data, _ = result
+			
+			self._clear_lazy_attributes()
+			self.__init__(client, user_data)
 		
-		self.__init__(client, user_data)
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('users', f'v1/users/{self.id}')
+		))
 
 
 class AuthenticatedUser(User):
+	__slots__ = ()
+	
 	def __init__(self, client: Client, data: dict):
 		super().__init__(client, data)
 	
 	def follow_user(self, target_id: int):
 		client = self.client
-		_, res = client.fetcher.post(
+		return chain(lambda result: result[1], client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{target_id}/follow')
-		)
-		
-		return res
+		))
 	
 	def unfollow_user(self, target_id: int):
 		client = self.client
-		_, res = client.fetcher.post(
+		return chain(lambda result: result[1], client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{target_id}/unfollow')
-		)
-		
-		return res
+		))
 	
 	
 	def get_friend_requets(self, page_size: int = 10, sort_order: SortOrder = SortOrder.Descending):
@@ -234,20 +266,20 @@ class AuthenticatedUser(User):
 	
 	def send_friend_request(self, target_id: int):
 		client = self.client
-		_, res = client.fetcher.post(
+		return chain(lambda result: result[1], client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{target_id}/request-friendship')
-		)
-		
-		return res
+		))
 	
 	def unfriend_user(self, target_id: int):
 		client = self.client
-		client.fetcher.post(
+		
+		return chain(lambda _: None, client.fetcher.post(
 			url=client.url_generator.get_url('friends', f'v1/users/{target_id}/unfriend')
-		)
+		))
 
 class Friend(User):
-	def __init__(self, client: Client, data: dict):
-		super().__init__(client, data)
-		
-		self.is_online = data.get('isOnline')
\ No newline at end of file
+	__slots__ = ()
+	
+	@lazy_attribute
+	def is_online(self):
+		return self.raw.get('isOnline')
\ No newline at end of file
@@ -1,35 +1,157 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Callable, Union
+from time import time
 
-from .utility.fetcher import Fetcher
+from .utility.fetcher import Fetcher, get_status_code
 from .utility.url import URLGenerator
+from .utility.ratelimit import RateLimiter, RateLimit
+from .utility.retry import RetryPolicy
+from .utility.batching import Batcher, AsyncBatcher
+from .utility.awaitables import chain, resolved, rejected
+from .utility.persistentcache import SQLiteCache
+from .utility.cache import LRUCache, MISSING
+from .utility.decoding import JSONDecoder, get_decoder
 
 from .services.presence import PresenceProvider
 from .services.economy import EconomyProvider
 from .services.inventory import InventoryProvider
-from .services.thumbnail import ThumbnailProvider
+from .services.thumbnail import ThumbnailProvider, AsyncThumbnailProvider, get_thumbnail_data, rebuild_thumbnail
 from .services.avatar import AvatarProvider
 from .services.users import UserProvider
 
 from .classes.groups import Group, BaseGroup
-from .classes.users import User, BaseUser, AuthenticatedUser
+from .classes.users import User, BaseUser, AuthenticatedUser, Friend
 from .classes.places import Place, BasePlace
 from .classes.universes import Universe, BaseUniverse
 from .classes.badges import Badge
 
+from .exceptions import NotFoundError
+
 if TYPE_CHECKING:
 	from .types import UserOrId, PlaceOrId, UniverseOrId
 
+UNIVERSES_BATCH_SIZE = 50
+PLACES_BATCH_SIZE = 50
+
+# how each subcache gets stored as raw json in the persistent cache, and rebuilt from it
+CACHE_SERIALIZERS = {
+	'users': (lambda user: user.raw, lambda client, raw: User(client, raw)),
+	'places': (lambda place: place.raw, lambda client, raw: Place(client, raw)),
+	'universes': (lambda universe: universe.raw, lambda client, raw: Universe(client, raw)),
+	'friends': (
+		lambda friends: None if any(friend.raw is None for friend in friends) else [friend.raw for friend in friends],
+		lambda client, raws: [Friend(client, raw) for raw in raws]
+	),
+	'thumbnails': (get_thumbnail_data, lambda client, data: rebuild_thumbnail(data)),
+	
+	'universe_ids': (lambda universe_id: universe_id, lambda client, universe_id: universe_id),
+	'negative': (lambda value: value, lambda client, value: value)
+}
+
+DEFAULT_CACHE_TTLS = {
+	'users': 24 * 60 * 60,
+	'places': 24 * 60 * 60,
+	'universes': 5 * 60, # playing counts go stale quickly
+	'friends': 10 * 60,
+	'thumbnails': 60 * 60, # only with cache_thumbnails on, they aren't revalidated so this is how stale they can get
+	
+	'universe_ids': None,
+	'negative': 10 * 60 # ids that 404'd or came back empty, kept short in case they show up later
+}
+
+DEFAULT_CACHE_SIZES = {
+	'users': 10000,
+	'places': 10000,
+	'universes': 10000,
+	'friends': 1000, # these are whole friends lists
+	'thumbnails': 10000,
+	
+	'universe_ids': 100000,
+	'negative': 100000
+}
+
 class ClientConfig:
 	def __init__(self,
 			do_caching: bool = True,
 			debug_print_requests: bool = False,
-			retry_timer: float = 60
+			retry_timer: float = 60,
+			rate_limits: Optional[dict[str, RateLimit]] = None,
+			default_rate_limit: Optional[RateLimit] = None,
+			retry_policy: Optional[RetryPolicy] = None,
+			pool_maxsize: int = 10,
+			pool_sizes: Optional[dict[str, int]] = None,
+			pool_block: bool = False,
+			coalesce_requests: bool = True,
+			batch_requests: bool = False,
+			batch_window: float = 0.01,
+			max_chunk_workers: int = 4,
+			http_cache_size: int = 1024,
+			cache_path: Optional[str] = None,
+			cache_ttls: Optional[dict[str, Optional[float]]] = None,
+			cache_sizes: Optional[dict[str, Optional[int]]] = None,
+			cache_factory: Optional[Callable[[str], Any]] = None,
+			json_decoder: Union[str, JSONDecoder] = 'auto',
+			lazy_models: bool = False,
+			keep_raw: bool = True,
+			cache_thumbnails: bool = False
 		):
 		
 		self._debug_print_requests = debug_print_requests
 		self.do_caching = do_caching
 		self.retry_timer = retry_timer
+		
+		if retry_policy is None:
+			# retry_timer used to be a fixed sleep between 429 retries, it now caps the backoff instead
+			retry_policy = RetryPolicy(max_delay=retry_timer) if retry_timer > 0 else RetryPolicy(max_retries=0)
+		
+		self.retry_policy = retry_policy
+		
+		# connection pool size per host, pool_sizes is keyed by subdomain and falls back to pool_maxsize
+		self.pool_maxsize = pool_maxsize
+		self.pool_sizes = pool_sizes or {}
+		self.pool_block = pool_block
+		
+		# identical GETs that are in flight at the same time share one response
+		self.coalesce_requests = coalesce_requests
+		
+		# per-object calls like BaseUser.get_presence made within batch_window get merged into one bulk request
+		self.batch_requests = batch_requests
+		self.batch_window = batch_window
+		
+		# multigets bigger than their endpoint's limit get split up and sent this many at a time
+		self.max_chunk_workers = max_chunk_workers
+		
+		# how many GET responses to keep around for ETag / Last-Modified / max-age reuse, 0 turns it off
+		self.http_cache_size = http_cache_size
+		
+		# an sqlite file that users, places, universes and universe ids get persisted to,
+		# so several worker processes on one host can share what they've already fetched
+		self.cache_path = cache_path
+		
+		# ttls apply to both the in memory and persistent caches, sizes only to the in memory ones
+		self.cache_ttls = {**DEFAULT_CACHE_TTLS, **(cache_ttls or {})}
+		self.cache_sizes = {**DEFAULT_CACHE_SIZES, **(cache_sizes or {})}
+		
+		# anything with get(key, default) / set(key, value) can be swapped in for a subcache
+		self.cache_factory = cache_factory or (lambda cache_name: LRUCache(self.cache_sizes.get(cache_name), self.cache_ttls.get(cache_name)))
+		
+		# 'auto' picks orjson or msgspec when they're installed and falls back to the json module
+		self.decode_json = get_decoder(json_decoder)
+		
+		# models only keep their raw data and work out fields like dates and nested objects when first read,
+		# worth turning on when most of a big page of results is never looked at
+		self.lazy_models = lazy_models
+		
+		# models hang on to the response they were built from as .raw, turning this off saves a lot of memory
+		# when holding onto huge numbers of them, but also turns off lazy_models and the persistent cache
+		self.keep_raw = keep_raw
+		
+		# completed thumbnails go in the 'thumbnails' subcache when this is on, off by default since their version
+		# isn't checked and a cached one keeps getting served until its ttl runs out even if the image changed
+		self.cache_thumbnails = cache_thumbnails
+		
+		# keyed by subdomain (presence, thumbnails, games...), clients sharing a config share its budgets
+		self.rate_limiter = RateLimiter(rate_limits, default_rate_limit)
 
 class Client:
 	def __init__(self, token: str = None, config: Optional[ClientConfig] = None , base_url = 'roblox.com'):
@@ -38,38 +160,59 @@ class Client:
 		
 		self.config = config
 		self.cached = {
-			'users': {},
-			'places': {},
-			'universes': {},
-			
-			'universe_ids': {}
+			cache_name: config.cache_factory(cache_name)
+			for cache_name in ('users', 'places', 'universes', 'friends', 'thumbnails', 'universe_ids', 'negative')
 		}
 		
-		self.fetcher = Fetcher(self)
+		self.persistent_cache = SQLiteCache(config.cache_path) if config.cache_path else None
+		
 		self.url_generator = URLGenerator(base_url)
 		
+		self._setup_providers()
+		
+		if token:
+			self.set_token(token)
+	
+	def _setup_providers(self):
+		self.fetcher = Fetcher(self)
+		self.batcher = Batcher(self)
+		
 		self.economy = EconomyProvider(self)
 		self.presence = PresenceProvider(self)
 		self.inventory = InventoryProvider(self)
 		self.thumbnails = ThumbnailProvider(self)
 		self.avatar = AvatarProvider(self)
 		self.users = UserProvider(self)
-		
-		if token:
-			self.set_token(token)
 	
-	def get_cache(self, cache_name: str, index: str):
+	def get_cache(self, cache_name: str, index: str, default: Any = None):
 		if not self.config.do_caching:
-			return
+			return default
 		
 		sub_cache = self.cached.get(cache_name)
 		
 		if sub_cache is None:
 			print(f'missing subcache {cache_name}')
 			
-			return
+			return default
 		
-		return sub_cache.get(index)
+		value = sub_cache.get(index, MISSING)
+		
+		if value is MISSING and self.persistent_cache is not None:
+			entry = self.persistent_cache.get_entry(cache_name, index)
+			
+			if entry is not None:
+				raw, expires = entry
+				
+				_, rebuild = CACHE_SERIALIZERS[cache_name]
+				value = rebuild(self, raw)
+				
+				# only as long as it has left in the persistent cache, not a whole new ttl
+				if expires is not None and isinstance(sub_cache, LRUCache):
+					sub_cache.set(index, value, ttl=max(expires - time(), 0))
+				else:
+					sub_cache.set(index, value)
+		
+		return default if value is MISSING else value
 	
 	def set_cache(self, cache_name: str, index: str, new_value: Any):
 		if not self.config.do_caching:
@@ -82,24 +225,69 @@ class Client:
 			
 			return
 		
-		sub_cache[index] = new_value
+		sub_cache.set(index, new_value)
+		
+		if self.persistent_cache is not None and new_value is not None:
+			serialize, _ = CACHE_SERIALIZERS[cache_name]
+			serialized = serialize(new_value)
+			
+			# models built with keep_raw off have nothing left to persist
+			if serialized is not None:
+				self.persistent_cache.set(cache_name, index, serialized, self.config.cache_ttls.get(cache_name))
 	
+	def mark_missing(self, kind: str, index: Any):
+		self.set_cache('negative', (kind, index), True)
 	
-	def _get_universe_id(self, place_id: int) -> int:
-		cached_id = self.get_cache('universe_ids', place_id)
+	def is_missing(self, kind: str, index: Any) -> bool:
+		return self.get_cache('negative', (kind, index), False)
+	
+	def _cache_and_return(self, cache_name: str, index: Any, value: Any):
+		self.set_cache(cache_name, index, value)
 		
-		if cached_id:
-			return cached_id
+		return value
+	
+	def _mark_absent(self, kind: str, ids: list[int], results: list, key: Callable[[Any], int] = lambda result: result.id):
+		found = {key(result) for result in results}
 		
-		universe_data, _ = self.fetcher.get(
-			url=self.url_generator.get_url('apis', f'universes/v1/places/{place_id}/universe')
-		)
+		for index in ids:
+			if index not in found:
+				self.mark_missing(kind, index)
 		
-		universe_id = universe_data.get('universeId')
+		return results
+	
+	def get_cache_stats(self) -> dict[str, dict[str, float]]:
+		return {
+			cache_name: sub_cache.stats.as_dict()
+			for cache_name, sub_cache in self.cached.items()
+			if getattr(sub_cache, 'stats', None) is not None
+		}
+	
+	
+	def _get_universe_id(self, place_id: int) -> int:
+		if self.is_missing('universe_ids', place_id):
+			return resolved(self.fetcher, None)
+		
+		cached_id = self.get_cache('universe_ids', place_id, MISSING)
 		
-		self.set_cache('universe_ids', place_id, universe_id)
+		if cached_id is not MISSING:
+			return resolved(self.fetcher, cached_id)
+		
+		def handle(result):
+			universe_data, _ = result
+			universe_id = universe_data.get('universeId')
+			
+			if universe_id is None:
+				self.mark_missing('universe_ids', place_id)
+				
+				return
+			
+			self.set_cache('universe_ids', place_id, universe_id)
+			
+			return universe_id
 		
-		return universe_id
+		return chain(handle, self.fetcher.get(
+			url=self.url_generator.get_url('apis', f'universes/v1/places/{place_id}/universe')
+		))
 	
 	def set_token(self, token: str):
 		self.fetcher.set_cookie('.ROBLOSECURITY', token)
@@ -108,22 +296,22 @@ class Client:
 	def get_User(self, user: UserOrId) -> User:
 		user_id = int(user)
 		
-		cached_user = self.get_cache('users', user_id)
-		
-		if cached_user:
-			return cached_user
+		if self.is_missing('users', user_id):
+			return rejected(self.fetcher, NotFoundError('users', user_id))
 		
-		new_user = self.users.get_user(user_id=user_id)
+		cached_user = self.get_cache('users', user_id, MISSING)
 		
-		self.set_cache('users', user_id, new_user)
+		if cached_user is not MISSING:
+			return resolved(self.fetcher, cached_user)
 		
-		return new_user
+		# users that 404 get marked missing by the provider
+		return chain(lambda new_user: self._cache_and_return('users', user_id, new_user), self.users.get_user(user_id=user_id))
 	
 	def get_BaseUser(self, user_id: int) -> BaseUser:
 		return self.users.get_base_user(user_id=user_id)
 	
 	def get_AuthenticatedUser(self, full: bool = True) -> AuthenticatedUser:
-		return self.users.get_authenticated_user()
+		return self.users.get_authenticated_user(full=full)
 	
 	def multiget_Users_usernames(self, usernames: list[str], exclude_banned: bool = True):
 		return self.users.multiget_users_usernames(usernames=usernames, exclude_banned=exclude_banned)
@@ -133,85 +321,167 @@ class Client:
 	
 	
 	def get_Group(self, group_id: int) -> Group:
-		group_data, _ = self.fetcher.get(
-			url=self.url_generator.get_url('groups', f'v1/groups/{group_id}')
-		)
+		if self.is_missing('groups', group_id):
+			return rejected(self.fetcher, NotFoundError('groups', group_id))
+		
+		def handle(result):
+			group_data, response = result
+			
+			if get_status_code(response) == 404:
+				self.mark_missing('groups', group_id)
+				
+				raise NotFoundError('groups', group_id)
+			
+			return Group(self, group_data)
 		
-		return Group(self, group_data)
+		return chain(handle, self.fetcher.get(
+			url=self.url_generator.get_url('groups', f'v1/groups/{group_id}')
+		))
 	
 	def get_BaseGroup(self, group_id: int) -> BaseGroup:
 		return BaseGroup(self, group_id)
 	
 	
 	def get_Universe(self, universe: UniverseOrId=None, place: PlaceOrId=None) -> Universe:
-		universe_id = None
-		
-		if universe:
-			universe_id = int(universe)
-		
-		if place and not universe_id:
-			universe_id = self._get_universe_id(int(place))
+		if place and not universe:
+			place_id = int(place)
+			
+			def handle(universe_id):
+				if universe_id is None:
+					raise NotFoundError('universe_ids', place_id)
+				
+				return self._get_universe(universe_id)
+			
+			return chain(handle, self._get_universe_id(place_id))
 		
-		cached_universe = self.get_cache('universes', universe_id)
+		return self._get_universe(int(universe) if universe else None)
+	
+	def _get_universe(self, universe_id: int) -> Universe:
+		if self.is_missing('universes', universe_id):
+			return rejected(self.fetcher, NotFoundError('universes', universe_id))
 		
-		if cached_universe:
-			return cached_universe
+		cached_universe = self.get_cache('universes', universe_id, MISSING)
 		
-		new_universe = self.multiget_Universes([universe_id])[0]
+		if cached_universe is not MISSING:
+			return resolved(self.fetcher, cached_universe)
 		
-		self.set_cache('universes', universe_id, new_universe)
+		def handle(universes):
+			if not universes:
+				raise NotFoundError('universes', universe_id)
+			
+			return self._cache_and_return('universes', universe_id, universes[0])
 		
-		return new_universe
+		return chain(handle, self.multiget_Universes([universe_id]))
 	
 	def get_BaseUniverse(self, universe_id: int) -> BaseUniverse:
 		return BaseUniverse(universe_id)
 	
 	def multiget_Universes(self, universe_ids: list[int]) -> list[Universe]:
-		universes_data, _ = self.fetcher.get(
-			url=self.url_generator.get_url('games', 'v1/games'),
-			params = {'universeIds': universe_ids}
-		)
+		def get_chunk(chunk: list[int]):
+			def handle(result):
+				universes_data, _ = result
+				
+				return [Universe(self, data=universe_data) for universe_data in universes_data['data']]
+			
+			return chain(handle, self.fetcher.get(
+				url=self.url_generator.get_url('games', 'v1/games'),
+				params = {'universeIds': chunk}
+			))
+		
+		universe_ids = [universe_id for universe_id in map(int, universe_ids) if not self.is_missing('universes', universe_id)]
 		
-		return [Universe(self, data=universe_data) for universe_data in universes_data['data']]
+		return chain(
+			lambda universes: self._mark_absent('universes', universe_ids, universes),
+			self.fetcher.map_chunks(universe_ids, UNIVERSES_BATCH_SIZE, get_chunk, key=lambda universe: universe.id)
+		)
 	
 	def multiget_Universes_place_ids(self, place_ids: list[int]) -> list[Universe]:
-		places = self.multiget_Places(place_ids)
-		
-		return self.multiget_Universes([place.universe_id for place in places])
+		return chain(lambda places: self.multiget_Universes([place.universe_id for place in places]), self.multiget_Places(place_ids))
 	
 	
 	def get_Place(self, place: PlaceOrId) -> Place:
 		if not place:
-			return
+			return resolved(self.fetcher, None)
 		
 		place_id = int(place)
 		
-		cached_place = self.get_cache('places', place_id)
+		if self.is_missing('places', place_id):
+			return rejected(self.fetcher, NotFoundError('places', place_id))
 		
-		if cached_place:
-			return cached_place
+		cached_place = self.get_cache('places', place_id, MISSING)
 		
-		new_place = self.multiget_Places([place_id])[0]
+		if cached_place is not MISSING:
+			return resolved(self.fetcher, cached_place)
 		
-		self.set_cache('places', place_id, new_place)
+		def handle(places):
+			if not places:
+				raise NotFoundError('places', place_id)
+			
+			return self._cache_and_return('places', place_id, places[0])
 		
-		return new_place
+		return chain(handle, self.multiget_Places([place_id]))
 	
 	def get_BasePlace(self, place_id: int) -> BasePlace:
 		return BasePlace(self, place_id)
 	
 	def multiget_Places(self, place_ids: list[int]) -> list[Place]:
-		places_data, _ = self.fetcher.get(
-			url=self.url_generator.get_url('games', 'v1/games/multiget-place-details'),
-			params={'placeIds': place_ids}
-		)
+		def get_chunk(chunk: list[int]):
+			def handle(result):
+				places_data, _ = result
+				
+				return [Place(self, place_data) for place_data in places_data]
+			
+			return chain(handle, self.fetcher.get(
+				url=self.url_generator.get_url('games', 'v1/games/multiget-place-details'),
+				params={'placeIds': chunk}
+			))
 		
-		return [Place(self, place_data) for place_data in places_data]
+		place_ids = [place_id for place_id in map(int, place_ids) if not self.is_missing('places', place_id)]
+		
+		return chain(
+			lambda places: self._mark_absent('places', place_ids, places),
+			self.fetcher.map_chunks(place_ids, PLACES_BATCH_SIZE, get_chunk, key=lambda place: place.id)
+		)
 	
 	
 	def get_Badge(self, badge_id: int):
-		badge_data, _ = self.fetcher.get(
+		if self.is_missing('badges', badge_id):
+			return rejected(self.fetcher, NotFoundError('badges', badge_id))
+		
+		def handle(result):
+			badge_data, response = result
+			
+			if get_status_code(response) == 404:
+				self.mark_missing('badges', badge_id)
+				
+				raise NotFoundError('badges', badge_id)
+			
+			return Badge(self, badge_data)
+		
+		return chain(handle, self.fetcher.get(
 			url=self.url_generator.get_url('badges', f'v1/badges/{badge_id}')
-		)
+		))
+
+
+class AsyncClient(Client):
+	def _setup_providers(self):
+		from .utility.asyncfetcher import AsyncFetcher
 		
-		return Badge(self, badge_data)
\ No newline at end of file
+		self.fetcher = AsyncFetcher(self)
+		self.batcher = AsyncBatcher(self)
+		
+		self.economy = EconomyProvider(self)
+		self.presence = PresenceProvider(self)
+		self.inventory = InventoryProvider(self)
+		self.thumbnails = AsyncThumbnailProvider(self)
+		self.avatar = AvatarProvider(self)
+		self.users = UserProvider(self)
+	
+	async def close(self):
+		await self.fetcher.close()
+	
+	async def __aenter__(self):
+		return self
+	
+	async def __aexit__(self, *_):
+		await self.close()
\ No newline at end of file
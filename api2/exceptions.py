@@ -0,0 +1,15 @@
+class NotFoundError(LookupError):
+	def __init__(self, kind: str, id: int) -> None:
+		super().__init__(f'{kind} {id!r} could not be found')
+		
+		self.kind = kind
+		self.id = id
+
+class PageError(RuntimeError):
+	def __init__(self, url: str, status: int, errors: list) -> None:
+		message = '; '.join(str(error.get('message')) for error in errors if isinstance(error, dict)) or 'no data in the response'
+		super().__init__(f'page of {url!r} failed with {status}: {message}')
+		
+		self.url = url
+		self.status = status
+		self.errors = errors
\ No newline at end of file
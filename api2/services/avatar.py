@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from .baseprovider import BaseProvider
 from ..enums import AvatarType, OutfitType
 from ..utility.fetcher import PageIterator
+from ..utility.awaitables import chain
 from ..classes.badges import BaseData
 
 if TYPE_CHECKING:
@@ -13,6 +14,8 @@ if TYPE_CHECKING:
 	from ..client import Client
 
 class AvatarScales:
+	__slots__ = ('body_type', 'propertion', 'height_scale', 'width_scale', 'head_scale', 'depth_scale')
+	
 	def __init__(self, scale_data: dict) -> None:
 		self.body_type = scale_data.get('bodyType')
 		self.propertion = scale_data.get('proportion')
@@ -23,6 +26,8 @@ class AvatarScales:
 		self.depth_scale = scale_data.get('depth')
 
 class AvatarBodyColors:
+	__slots__ = ('head_color', 'torso_color', 'right_arm_color', 'left_arm_color', 'right_leg_color', 'left_leg_color')
+	
 	def __init__(self, color_data: dict) -> None:
 		self.head_color = color_data['headColor3']
 		self.torso_color = color_data['torsoColor3']
@@ -32,6 +37,8 @@ class AvatarBodyColors:
 		self.left_leg_color = color_data['leftLegColor3']
 
 class AvatarDetails:
+	__slots__ = ('avatar_type', 'scales', 'body_colors', 'default_shirt_applied', 'default_pants_applied', 'assets', 'emotes')
+	
 	def __init__(self, data: dict) -> None:
 		self.avatar_type = AvatarType(data['playerAvatarType'])
 		
@@ -45,6 +52,8 @@ class AvatarDetails:
 		self.emotes = data['emotes']
 
 class Outfit(BaseData):
+	__slots__ = ('name', 'is_editable')
+	
 	def __init__(self, client: Client, outfit_data: dict) -> None:
 		super().__init__(client, outfit_data['id'])
 		
@@ -52,7 +61,7 @@ class Outfit(BaseData):
 		self.is_editable = outfit_data['isEditable']
 	
 	def get_thumbnail(self):
-		return self.client.thumbnails.get_outfit_thumbnails([self.id])[0]
+		return self.client.thumbnails.get_outfit_thumbnail(self.id)
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.name} {self.id}>'
@@ -75,24 +84,24 @@ class AvatarProvider(BaseProvider):
 	def get_user_currently_wearing(self, user: UserOrId):
 		client = self.client
 		
-		avatar_json, _ = client.fetcher.get(
-			url=client.url_generator.get_url('avatar', f'v1/users/{int(user)}/currently-wearing')
-		)
-		
-		asset_ids = None
-		
-		try:
-			asset_ids = avatar_json['assetIds']
-		except:
-			asset_ids = []
+		def handle(result):
+			avatar_json, _ = result
+			asset_ids = None
+			
+			try:
+				asset_ids = avatar_json['assetIds']
+			except:
+				asset_ids = []
+			
+			return asset_ids
 		
-		return asset_ids
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('avatar', f'v1/users/{int(user)}/currently-wearing')
+		))
 	
 	def get_user_avatar_details(self, user: UserOrId):
 		client = self.client
 		
-		avatar_details_data, _ = client.fetcher.get(
+		return chain(lambda result: AvatarDetails(result[0]), client.fetcher.get(
 			url=client.url_generator.get_url('avatar', f'v2/avatar/users/{int(user)}/avatar')
-		)
-		
-		return AvatarDetails(avatar_details_data)
\ No newline at end of file
+		))
\ No newline at end of file
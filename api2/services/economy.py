@@ -2,25 +2,27 @@
 # https://premiumfeatures.roblox.com/docs/index.html
 
 from .baseprovider import BaseProvider
+from ..utility.awaitables import chain
 
 class EconomyProvider(BaseProvider):
 	def get_user_has_premium(self, user_id: int):
 		client = self.client
 		
-		has_premium, _ = client.fetcher.get(
+		return chain(lambda result: result[0], client.fetcher.get(
 			url=client.url_generator.get_url('premiumfeatures', f'v1/users/{user_id}/validate-membership')
-		)
-		
-		return has_premium
+		))
 	
 	def get_user_currency(self, user_id: int):
 		client = self.client
 		
-		currency_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('economy', f'v1/users/{user_id}/currency')
-		)
+		def handle(result):
+			currency_data, _ = result
+			
+			try:
+				return currency_data['robux']
+			except:
+				return -1
 		
-		try:
-			return currency_data['robux']
-		except:
-			return -1
\ No newline at end of file
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('economy', f'v1/users/{user_id}/currency')
+		))
\ No newline at end of file
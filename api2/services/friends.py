@@ -0,0 +1,501 @@
+# https://friends.roblox.com/docs/index.html
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from operator import sub
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
+
+from ..utility.awaitables import chain
+from ..utility.idset import IdSet
+from ..utility.checkpoints import save_checkpoint, load_checkpoint
+
+if TYPE_CHECKING:
+	import numpy
+	
+	from ..types import UserOrId
+	from ..client import Client
+
+# how many pairs bulk FriendGraph queries lay out at a time
+PAIR_CHUNK_SIZE = 8192
+
+# numpy only speeds up bulk FriendGraph queries and is slow to import, so the first one tries importing it
+numpy = None
+_numpy_checked = False
+
+def _has_numpy() -> bool:
+	global numpy, _numpy_checked
+	
+	if not _numpy_checked:
+		try:
+			import numpy as numpy_module
+		except ImportError:
+			numpy_module = None
+		
+		numpy, _numpy_checked = numpy_module, True
+	
+	return numpy is not None
+
+class FriendGraph:
+	# friends lists packed csr style, every user's friend ids sorted one after another in a single array,
+	# which is about 8 bytes per friendship. lists can be added at any point, looking up a single user reads
+	# them straight away and they get packed in with the rest the next time a bulk query needs it
+	def __init__(self, friend_lists: Optional[Union[dict, Iterable[tuple]]] = None) -> None:
+		# user_ids[index]'s friends are friend_ids[offsets[index]:offsets[index + 1]]
+		self.user_ids = array('q')
+		self.offsets = array('q', [0])
+		self.friend_ids = array('q')
+		
+		self.pending: dict[int, array] = {}
+		
+		if friend_lists:
+			self.update(friend_lists)
+	
+	def add_friends(self, user: UserOrId, friends: Iterable[UserOrId]):
+		# replaces whatever was there for the user before
+		self.pending[int(user)] = array('q', sorted(set(map(int, friends))))
+	
+	def update(self, friend_lists: Union[dict, Iterable[tuple]]):
+		# takes {user: friends} or (user, friends) pairs, like what FriendCrawler.iter_friend_lists yields
+		items = friend_lists.items() if isinstance(friend_lists, dict) else friend_lists
+		
+		for user, friends in items:
+			self.add_friends(user, friends)
+	
+	def _get_index(self, user_id: int) -> Optional[int]:
+		user_ids = self.user_ids
+		index = bisect_left(user_ids, user_id)
+		
+		if index < len(user_ids) and user_ids[index] == user_id:
+			return index
+	
+	def _pack(self):
+		# copies the packed users over in runs between the pending ones, so only the pending users get touched from python
+		pending = self.pending
+		
+		if not pending:
+			return
+		
+		user_ids, offsets, friend_ids = self.user_ids, self.offsets, self.friend_ids
+		
+		new_user_ids = array('q')
+		new_friend_ids = array('q')
+		degrees = array('q')
+		start = 0
+		
+		def copy_run(start: int, end: int):
+			new_user_ids.extend(user_ids[start:end])
+			new_friend_ids.extend(friend_ids[offsets[start]:offsets[end]])
+			degrees.extend(map(sub, offsets[start + 1:end + 1], offsets[start:end]))
+		
+		for user_id in sorted(pending):
+			end = bisect_left(user_ids, user_id, start)
+			copy_run(start, end)
+			
+			friends = pending[user_id]
+			
+			new_user_ids.append(user_id)
+			new_friend_ids.extend(friends)
+			degrees.append(len(friends))
+			
+			# a re-added user's old list gets skipped over
+			start = end + 1 if end < len(user_ids) and user_ids[end] == user_id else end
+		
+		copy_run(start, len(user_ids))
+		
+		self.user_ids = new_user_ids
+		self.offsets = array('q', accumulate(degrees, initial=0))
+		self.friend_ids = new_friend_ids
+		self.pending = {}
+	
+	def get_friend_ids(self, user: UserOrId) -> Optional[array]:
+		# sorted, or None if the user's friends haven't been added
+		user_id = int(user)
+		friends = self.pending.get(user_id)
+		
+		if friends is not None:
+			return friends
+		
+		index = self._get_index(user_id)
+		
+		if index is None:
+			return
+		
+		return self.friend_ids[self.offsets[index]:self.offsets[index + 1]]
+	
+	def _get_loaded_friend_ids(self, user: UserOrId) -> array:
+		friends = self.get_friend_ids(user)
+		
+		if friends is None:
+			raise KeyError(f'no friends list added for user {int(user)}')
+		
+		return friends
+	
+	def get_mutual_ids(self, user: UserOrId, other: UserOrId) -> list[int]:
+		friends = self._get_loaded_friend_ids(user)
+		other_friends = self._get_loaded_friend_ids(other)
+		
+		return sorted(set(friends).intersection(other_friends))
+	
+	def _get_pair_ranges(self, pairs: Iterable[tuple[UserOrId, UserOrId]]):
+		# where both sides of every pair are in the packed arrays, as numpy arrays
+		self._pack()
+		
+		pairs = numpy.array([(int(user), int(other)) for user, other in pairs], dtype=numpy.int64).reshape(-1, 2)
+		
+		user_ids = numpy.frombuffer(self.user_ids, dtype=numpy.int64)
+		offsets = numpy.frombuffer(self.offsets, dtype=numpy.int64)
+		
+		indices = numpy.searchsorted(user_ids, pairs).clip(max=max(len(user_ids) - 1, 0))
+		missing = user_ids[indices] != pairs if len(user_ids) else numpy.ones(pairs.shape, dtype=bool)
+		
+		if missing.any():
+			raise KeyError(f'no friends list added for user {int(pairs[missing][0])}')
+		
+		return offsets[indices], offsets[indices + 1]
+	
+	def _get_pair_keys(self, friend_ids, starts, lengths, stride: int):
+		# every friend id on one side of the pairs as pair index * stride + friend id, which comes out sorted
+		# since each friends list is sorted
+		run_starts = numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+		positions = numpy.arange(int(lengths.sum())) - run_starts + numpy.repeat(starts, lengths)
+		
+		return numpy.repeat(numpy.arange(len(lengths)), lengths) * stride + friend_ids[positions]
+	
+	def _count_mutuals_numpy(self, pairs: Iterable[tuple[UserOrId, UserOrId]]):
+		starts, ends = self._get_pair_ranges(pairs)
+		degrees = ends - starts
+		counts = numpy.zeros(len(starts), dtype=numpy.int64)
+		
+		friend_ids = numpy.frombuffer(self.friend_ids, dtype=numpy.int64)
+		
+		if not len(friend_ids):
+			return counts, degrees
+		
+		# the keys have to fit in an int64, which also caps how many pairs get laid out at once
+		stride = int(friend_ids.max()) + 1
+		chunk_size = max(1, min(PAIR_CHUNK_SIZE, (2 ** 63 - 1) // stride))
+		
+		for chunk_start in range(0, len(starts), chunk_size):
+			chunk = slice(chunk_start, chunk_start + chunk_size)
+			
+			keys = self._get_pair_keys(friend_ids, starts[chunk, 0], degrees[chunk, 0], stride)
+			other_keys = self._get_pair_keys(friend_ids, starts[chunk, 1], degrees[chunk, 1], stride)
+			
+			# a stable sort of two sorted runs is just a merge, and a key that's on both sides ends up next to itself
+			merged = numpy.concatenate((keys, other_keys))
+			merged.sort(kind='stable')
+			
+			mutual_keys = merged[1:][merged[1:] == merged[:-1]]
+			
+			counts[chunk] = numpy.bincount(mutual_keys // stride, minlength=len(counts[chunk]))
+		
+		return counts, degrees
+	
+	def count_mutuals(self, pairs: Iterable[tuple[UserOrId, UserOrId]]):
+		# how many friends each (user, other) pair has in common, all pairs are done at once with numpy
+		# and come back as an array, without numpy it's a list worked out one pair at a time
+		if _has_numpy():
+			counts, _ = self._count_mutuals_numpy(pairs)
+			
+			return counts
+		
+		return [len(set(self._get_loaded_friend_ids(user)).intersection(self._get_loaded_friend_ids(other))) for user, other in pairs]
+	
+	def get_overlaps(self, pairs: Iterable[tuple[UserOrId, UserOrId]]):
+		# mutuals over everyone either side of each pair is friends with (jaccard), 0 when both have no friends
+		if _has_numpy():
+			counts, degrees = self._count_mutuals_numpy(pairs)
+			unions = degrees.sum(axis=1) - counts
+			
+			return numpy.divide(counts, unions, out=numpy.zeros(len(counts)), where=unions > 0)
+		
+		overlaps = []
+		
+		for user, other in pairs:
+			friends = set(self._get_loaded_friend_ids(user))
+			other_friends = self._get_loaded_friend_ids(other)
+			
+			mutual_count = len(friends.intersection(other_friends))
+			union_count = len(friends) + len(other_friends) - mutual_count
+			
+			overlaps.append(mutual_count / union_count if union_count else 0.0)
+		
+		return overlaps
+	
+	def __contains__(self, user: UserOrId) -> bool:
+		user_id = int(user)
+		
+		return user_id in self.pending or self._get_index(user_id) is not None
+	
+	def __len__(self) -> int:
+		self._pack()
+		
+		return len(self.user_ids)
+	
+	def __repr__(self) -> str:
+		self._pack()
+		
+		return f'<{self.__class__.__name__}: {len(self.user_ids)} users, {len(self.friend_ids)} friend ids>'
+
+class FriendCrawler:
+	# breadth first walk over friends lists from a few seed users, a pool of workers fetches the friends of every user
+	# at the current depth (each request still goes through the client's rate limiter) and they're streamed out as they come in,
+	# depth 0 is the seeds so max_depth=2 expands the seeds and their friends and stops at friends of friends
+	def __init__(
+			self,
+			client: Client,
+			seeds: Iterable[UserOrId] = (),
+			max_depth: int = 2,
+			max_nodes: Optional[int] = None,
+			max_workers: int = 8,
+			skip_errors: bool = False
+		) -> None:
+		
+		self.client = client
+		
+		self.max_depth = max_depth
+		self.max_nodes = max_nodes
+		self.max_workers = max_workers
+		
+		# with skip_errors on a user whose friends can't be fetched is left out and the error is kept here instead of being raised
+		self.skip_errors = skip_errors
+		self.errors: dict[int, Exception] = {}
+		
+		# every user found so far, and the ones whose friends have been handed out
+		self.visited = IdSet()
+		self.expanded = IdSet()
+		
+		# users left to expand at the current depth, the ones fetching or waiting to be handed out, and what's been found for the next depth
+		self.depth = 0
+		self.frontier = array('q')
+		self.frontier_index = 0
+		self.pending: set[int] = set()
+		self.next_frontier = array('q')
+		
+		self.is_finished = False
+		
+		self.checkpoint_path = None
+		self.checkpoint_every = 100
+		self._handled_since_checkpoint = 0
+		
+		for user_id in map(int, seeds):
+			if self.visited.add(user_id) and max_depth > 0:
+				self.frontier.append(user_id)
+	
+	def getCheckpoint(self) -> dict:
+		# users that are still out get expanded again after a restore, so their edges can come out twice
+		return {
+			'max_depth': self.max_depth,
+			'depth': self.depth,
+			'frontier': sorted(self.pending) + self.frontier[self.frontier_index:].tolist(),
+			'next_frontier': self.next_frontier.tolist(),
+			# both come out sorted
+			'visited': list(self.visited),
+			'expanded': list(self.expanded),
+			'is_finished': self.is_finished
+		}
+	
+	def restoreCheckpoint(self, checkpoint: dict):
+		self.max_depth = checkpoint['max_depth']
+		self.depth = checkpoint['depth']
+		
+		self.frontier = array('q', checkpoint['frontier'])
+		self.frontier_index = 0
+		self.pending = set()
+		self.next_frontier = array('q', checkpoint['next_frontier'])
+		
+		self.visited = IdSet.from_sorted(checkpoint['visited'])
+		self.expanded = IdSet.from_sorted(checkpoint['expanded'])
+		
+		self.is_finished = checkpoint['is_finished']
+		
+		return self
+	
+	def saveCheckpoint(self, path: Optional[str] = None):
+		save_checkpoint(path or self.checkpoint_path, self.getCheckpoint())
+		
+		self._handled_since_checkpoint = 0
+	
+	def setCheckpointFile(self, path: str, every: int = 100):
+		# picks up from the file if it's there, then saves to it every few users once everything before is handled
+		self.checkpoint_path = path
+		self.checkpoint_every = every
+		
+		checkpoint = load_checkpoint(path)
+		
+		if checkpoint is not None:
+			self.restoreCheckpoint(checkpoint)
+		
+		return self
+	
+	def _get_next_user(self) -> Optional[int]:
+		if self.frontier_index >= len(self.frontier):
+			return
+		
+		user_id = self.frontier[self.frontier_index]
+		self.frontier_index += 1
+		self.pending.add(user_id)
+		
+		return user_id
+	
+	def _next_depth(self) -> bool:
+		# only moves on once everything at this depth is handled, so every user's depth is known from the frontier it's in
+		if not self.next_frontier:
+			return False
+		
+		self.depth += 1
+		self.frontier = self.next_frontier
+		self.frontier_index = 0
+		self.next_frontier = array('q')
+		
+		return True
+	
+	def _fetch_friend_ids(self, user_id: int):
+		client = self.client
+		
+		def handle(result):
+			friends_json, _ = result
+			friends_data = friends_json.get('data') if isinstance(friends_json, dict) else None
+			
+			return [data['id'] for data in friends_data or ()]
+		
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('friends', f'v1/users/{user_id}/friends')
+		))
+	
+	def _handle_result(self, user_id: int, get_result) -> Optional[list[int]]:
+		try:
+			friend_ids = get_result()
+		except Exception as error:
+			if not self.skip_errors:
+				raise
+			
+			self.errors[user_id] = error
+			
+			return
+		
+		visited = self.visited
+		next_frontier = self.next_frontier
+		max_nodes = self.max_nodes
+		is_expandable = self.depth + 1 < self.max_depth
+		
+		for friend_id in friend_ids:
+			# past the node limit nobody new gets taken on, the users already found still get expanded
+			if max_nodes is not None and len(visited) >= max_nodes:
+				break
+			
+			if visited.add(friend_id) and is_expandable:
+				next_frontier.append(friend_id)
+		
+		return friend_ids
+	
+	def _user_handled(self, user_id: int, expanded: bool):
+		self.pending.discard(user_id)
+		
+		if expanded:
+			self.expanded.add(user_id)
+		
+		if self.checkpoint_path is None:
+			return
+		
+		self._handled_since_checkpoint += 1
+		
+		if self._handled_since_checkpoint >= self.checkpoint_every:
+			self.saveCheckpoint()
+	
+	def _finish(self):
+		self.is_finished = True
+		
+		if self.checkpoint_path is not None:
+			self.saveCheckpoint()
+	
+	def iter_friend_lists(self):
+		# yields (user_id, friend_ids) for every expanded user, friend_ids is the whole list including anyone past max_nodes
+		in_flight = {}
+		executor = ThreadPoolExecutor(max_workers=self.max_workers)
+		
+		try:
+			while not self.is_finished:
+				while len(in_flight) < self.max_workers:
+					user_id = self._get_next_user()
+					
+					if user_id is None:
+						break
+					
+					in_flight[executor.submit(self._fetch_friend_ids, user_id)] = user_id
+				
+				if not in_flight:
+					if not self._next_depth():
+						self._finish()
+					
+					continue
+				
+				done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+				
+				for future in done:
+					user_id = in_flight.pop(future)
+					friend_ids = self._handle_result(user_id, future.result)
+					
+					if friend_ids is not None:
+						yield user_id, friend_ids
+					
+					self._user_handled(user_id, friend_ids is not None)
+		finally:
+			executor.shutdown(wait=False, cancel_futures=True)
+	
+	async def aiter_friend_lists(self):
+		in_flight = {}
+		
+		try:
+			while not self.is_finished:
+				while len(in_flight) < self.max_workers:
+					user_id = self._get_next_user()
+					
+					if user_id is None:
+						break
+					
+					in_flight[asyncio.ensure_future(self._fetch_friend_ids(user_id))] = user_id
+				
+				if not in_flight:
+					if not self._next_depth():
+						self._finish()
+					
+					continue
+				
+				done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+				
+				for task in done:
+					user_id = in_flight.pop(task)
+					friend_ids = self._handle_result(user_id, task.result)
+					
+					if friend_ids is not None:
+						yield user_id, friend_ids
+					
+					self._user_handled(user_id, friend_ids is not None)
+		finally:
+			for task in in_flight:
+				task.cancel()
+	
+	def _get_edges(self, user_id: int, friend_ids: list[int]):
+		# friendships go both ways, so an edge to a user that's already been expanded came out with that user's friends
+		visited = self.visited
+		expanded = self.expanded
+		
+		return [(user_id, friend_id) for friend_id in friend_ids if friend_id in visited and friend_id not in expanded]
+	
+	def __iter__(self):
+		# yields every (user_id, friend_id) edge between found users once
+		for user_id, friend_ids in self.iter_friend_lists():
+			yield from self._get_edges(user_id, friend_ids)
+	
+	async def __aiter__(self):
+		async for user_id, friend_ids in self.aiter_friend_lists():
+			for edge in self._get_edges(user_id, friend_ids):
+				yield edge
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: depth {self.depth}/{self.max_depth}, {len(self.visited)} users>'
\ No newline at end of file
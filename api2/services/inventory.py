@@ -7,16 +7,26 @@ from .baseprovider import BaseProvider
 from ..enums import AssetType
 from ..classes.assets import Asset
 from ..utility.fetcher import PageIterator, SortOrder
+from ..utility.awaitables import chain, resolved
 
 class InventoryProvider(BaseProvider):
 	def can_view_inventory(self, user_id: int):
 		client = self.client
 		
-		inventory_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('inventory', f'v1/users/{user_id}/can-view-inventory')
-		)
+		if client.is_missing('hidden_inventories', user_id):
+			return resolved(client.fetcher, False)
+		
+		def handle(result):
+			inventory_data, _ = result
+			
+			if not inventory_data['canView']:
+				client.mark_missing('hidden_inventories', user_id)
+			
+			return inventory_data['canView']
 		
-		return inventory_data['canView']
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('inventory', f'v1/users/{user_id}/can-view-inventory')
+		))
 	
 	def get_user_inventory(self, user_id: int, asset_type: AssetType, page_size: int = 10, sort_order: SortOrder = SortOrder.Descending, handler: Optional[Callable] = None):
 		client = self.client
@@ -1,11 +1,15 @@
 # https://presence.roblox.com/docs/index.html
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+from time import monotonic, sleep
+from sys import intern
+import asyncio
 
-from dateutil.parser import parse
+from ..utility.timestamps import parse_timestamp
 
 from .baseprovider import BaseProvider
+from ..utility.awaitables import chain
 from ..classes.users import BaseUser
 from ..classes.universes import BaseUniverse
 from ..classes.places import BasePlace
@@ -15,6 +19,8 @@ if TYPE_CHECKING:
 	from ..types import UserOrId
 	from ..client import Client
 
+PRESENCE_BATCH_SIZE = 50
+
 PRESENCE_NAMES = [
 	'Offline',
 	'Online',
@@ -32,11 +38,13 @@ PRESENCE_COLORS = [
 ]
 
 class Presence:
+	__slots__ = ('presence_type', 'last_location', 'job_id', 'root_place_id', 'universe_id', 'user_id', 'user', 'root_place', 'universe')
+	
 	def __init__(self, client: Client, data: dict) -> None:
 		self.presence_type = PresenceType(data['userPresenceType'])
-	
+		
 		# not exactly sure why roblox remove this but i finally fixed it
-		# self.last_online = parse(data['lastOnline']).timestamp()
+		# self.last_online = parse_timestamp(data['lastOnline'])
 		self.last_location = data['lastLocation']
 		
 		self.job_id = data['gameId']
@@ -89,15 +97,205 @@ class Presence:
 		
 		return self.last_location == value.last_location and self.presence_type == value.presence_type
 
+class PresenceChange:
+	__slots__ = ('user_id', 'presence', 'previous_presence_type', 'previous_location', 'previous_root_place_id', 'previous_job_id')
+	
+	def __init__(self, user_id: int, presence: Presence, previous_state: Optional[tuple]) -> None:
+		self.user_id = user_id
+		self.presence = presence
+		
+		# none of these are set the first time a user is seen
+		presence_type, self.previous_location, self.previous_root_place_id, self.previous_job_id = previous_state or (None, None, None, None)
+		self.previous_presence_type = PresenceType(presence_type) if presence_type is not None else None
+	
+	@property
+	def went_online(self):
+		return self.previous_presence_type in (None, PresenceType.Offline) and self.presence.presence_type != PresenceType.Offline
+	
+	@property
+	def went_offline(self):
+		return self.previous_presence_type not in (None, PresenceType.Offline) and self.presence.presence_type == PresenceType.Offline
+	
+	def __repr__(self) -> str:
+		previous_name = self.previous_presence_type.name if self.previous_presence_type is not None else None
+		
+		return f'<{self.__class__.__name__}: {self.user_id} {previous_name} -> {self.presence.presence_type.name}>'
+
+def _get_presence_state(data: dict) -> tuple:
+	# all that's kept per user between polls, locations are interned since most users share a handful of them
+	last_location = data.get('lastLocation')
+	
+	return (
+		data['userPresenceType'],
+		intern(last_location) if last_location else last_location,
+		data.get('rootPlaceId'),
+		data.get('gameId')
+	)
+
+class PresenceWatcher:
+	# polls presences for a set of users and only hands back the ones that changed since the last poll,
+	# a change is what Presence.__eq__ looks at (type and location) plus, with track_jobs on, the place and server
+	def __init__(
+			self,
+			client: Client,
+			users: Iterable[UserOrId] = (),
+			interval: float = 30,
+			track_jobs: bool = True,
+			emit_initial: bool = False
+		) -> None:
+		
+		self.client = client
+		self.user_ids = set(map(int, users))
+		
+		self.interval = interval
+		self.track_jobs = track_jobs
+		self.emit_initial = emit_initial
+		
+		self.snapshot: dict[int, tuple] = {}
+		self.callbacks: list[Callable[[PresenceChange], None]] = []
+		
+		self.poll_count = 0
+		self.is_running = False
+	
+	def add_users(self, users: Iterable[UserOrId]):
+		self.user_ids.update(map(int, users))
+	
+	def remove_users(self, users: Iterable[UserOrId]):
+		for user_id in map(int, users):
+			self.user_ids.discard(user_id)
+			self.snapshot.pop(user_id, None)
+	
+	def on_change(self, callback: Callable[[PresenceChange], None]):
+		self.callbacks.append(callback)
+		
+		return callback
+	
+	def stop(self):
+		self.is_running = False
+	
+	def get_poll_interval(self) -> float:
+		# a full pass takes one request per batch, so stretch the interval out if the presence rate limit can't fit it
+		client = self.client
+		rate_limiter = client.config.rate_limiter
+		
+		subdomain = client.url_generator.get_subdomain(client.url_generator.get_url('presence', 'v1/presence/users'))
+		limit = rate_limiter.limits.get(subdomain, rate_limiter.default_limit)
+		
+		if limit is None:
+			return self.interval
+		
+		batch_count = -(-len(self.user_ids) // PRESENCE_BATCH_SIZE)
+		
+		return max(self.interval, batch_count / limit.rate)
+	
+	def _is_changed(self, previous_state: tuple, state: tuple) -> bool:
+		if self.track_jobs:
+			return previous_state != state
+		
+		return previous_state[:2] != state[:2]
+	
+	def _handle_presences(self, presences_data: list[dict]) -> list[PresenceChange]:
+		client = self.client
+		snapshot = self.snapshot
+		user_ids = self.user_ids
+		
+		changes = []
+		
+		for data in presences_data:
+			user_id = data['userId']
+			
+			# could have been removed while the poll was out
+			if user_id not in user_ids:
+				continue
+			
+			state = _get_presence_state(data)
+			previous_state = snapshot.get(user_id)
+			
+			snapshot[user_id] = state
+			
+			# the first sighting of a user (including ones added later on) is only a change with emit_initial
+			if previous_state is None:
+				if not self.emit_initial:
+					continue
+			elif not self._is_changed(previous_state, state):
+				continue
+			
+			changes.append(PresenceChange(user_id, Presence(client, data), previous_state))
+		
+		self.poll_count += 1
+		
+		for change in changes:
+			for callback in self.callbacks:
+				callback(change)
+		
+		return changes
+	
+	def poll(self) -> list[PresenceChange]:
+		# one pass over every user, awaitable with an AsyncClient
+		client = self.client
+		
+		def get_chunk(user_ids: list[int]):
+			return chain(lambda result: result[0]['userPresences'], client.fetcher.post(
+				url=client.url_generator.get_url('presence', 'v1/presence/users'),
+				payload={
+					"userIds": user_ids
+				}
+			))
+		
+		return chain(self._handle_presences, client.fetcher.map_chunks(list(self.user_ids), PRESENCE_BATCH_SIZE, get_chunk))
+	
+	def __iter__(self):
+		self.is_running = True
+		
+		while self.is_running:
+			started = monotonic()
+			
+			yield from self.poll()
+			
+			remaining = self.get_poll_interval() - (monotonic() - started)
+			
+			if remaining > 0 and self.is_running:
+				sleep(remaining)
+	
+	async def __aiter__(self):
+		self.is_running = True
+		
+		while self.is_running:
+			started = monotonic()
+			
+			for change in await self.poll():
+				yield change
+			
+			remaining = self.get_poll_interval() - (monotonic() - started)
+			
+			if remaining > 0 and self.is_running:
+				await asyncio.sleep(remaining)
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {len(self.user_ids)} users>'
+
 class PresenceProvider(BaseProvider):
+	def watch_user_presences(self, users: Iterable[UserOrId], interval: float = 30, track_jobs: bool = True, emit_initial: bool = False) -> PresenceWatcher:
+		return PresenceWatcher(self.client, users, interval=interval, track_jobs=track_jobs, emit_initial=emit_initial)
+	
+	
+	def get_user_presence(self, user: UserOrId) -> Presence:
+		return self.client.batcher.load(self.get_user_presences, int(user), key=lambda presence: presence.user_id)
+	
 	def get_user_presences(self, users: list[UserOrId]) -> list[Presence]:
 		client = self.client
 		
-		presence_data, _ = client.fetcher.post(
-			url=client.url_generator.get_url('presence', 'v1/presence/users'),
-			payload={
-				"userIds": list(map(int, users))
-			}
-		)
+		def get_chunk(user_ids: list[int]):
+			def handle(result):
+				presence_data, _ = result
+				
+				return [Presence(client, data) for data in presence_data['userPresences']]
+			
+			return chain(handle, client.fetcher.post(
+				url=client.url_generator.get_url('presence', 'v1/presence/users'),
+				payload={
+					"userIds": user_ids
+				}
+			))
 		
-		return [Presence(client, data) for data in presence_data['userPresences']]
\ No newline at end of file
+		return client.fetcher.map_chunks(list(map(int, users)), PRESENCE_BATCH_SIZE, get_chunk, key=lambda presence: presence.user_id)
\ No newline at end of file
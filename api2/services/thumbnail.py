@@ -1,15 +1,32 @@
 # https://thumbnails.roblox.com/docs/index.html
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional, Union
+from threading import Lock, Thread
+from concurrent.futures import Future
+from time import sleep
+import asyncio
 
 from .baseprovider import BaseProvider
+from ..utility.awaitables import chain
+from ..utility.chunking import order_results
+from ..utility.cache import MISSING
 from ..enums import UniverseThumbnailSize, ThumbnailFormat, ThumbnailState, UserThumbnailSize, UserThumbnailType, PlaceThumbnailPolicy, PlaceThumbnailSize, OutfitThumbnailSize
 
 if TYPE_CHECKING:
 	from ..types import UserOrId, PlaceOrId, UniverseOrId, BadgeOrId, OutfitOrId
+	from ..client import Client
+
+THUMBNAIL_BATCH_SIZE = 100
+
+# pending thumbnails get polled again up to this many times, the delay doubles every poll up to the max
+THUMBNAIL_MAX_POLLS = 5
+THUMBNAIL_POLL_DELAY = 0.5
+THUMBNAIL_MAX_POLL_DELAY = 8
 
 class Thumbnail:
+	__slots__ = ('image_url', 'target_id', 'version', 'state')
+	
 	def __init__(self, thumbnail_data: dict) -> None:
 		self.image_url = thumbnail_data['imageUrl']
 		self.target_id = thumbnail_data['targetId']
@@ -17,65 +34,374 @@ class Thumbnail:
 		self.version = thumbnail_data['version']
 		self.state = ThumbnailState(thumbnail_data['state'])
 	
+	@property
+	def is_pending(self):
+		return self.state == ThumbnailState.Pending
+	
+	@property
+	def is_completed(self):
+		return self.state == ThumbnailState.Completed
+	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.state.name} {self.image_url!r}>'
 
 class UniverseThumbnails:
+	__slots__ = ('universe_id', 'thumbnails')
+	
 	def __init__(self, universe_thumbnail_data: dict) -> None:
 		self.universe_id = universe_thumbnail_data['universeId']
 		self.thumbnails = [
 			Thumbnail(thumbnail_data)
 			for thumbnail_data in universe_thumbnail_data['thumbnails']
 		]
+	
+	@property
+	def is_pending(self):
+		return any(thumbnail.is_pending for thumbnail in self.thumbnails)
+	
+	@property
+	def is_completed(self):
+		return all(thumbnail.is_completed for thumbnail in self.thumbnails)
+
+def get_thumbnail_data(thumbnail: Union[Thumbnail, UniverseThumbnails]) -> dict:
+	# the json a thumbnail can be built back up from, for the persistent cache
+	if isinstance(thumbnail, UniverseThumbnails):
+		return {'universeId': thumbnail.universe_id, 'thumbnails': [get_thumbnail_data(child) for child in thumbnail.thumbnails]}
+	
+	return {'imageUrl': thumbnail.image_url, 'targetId': thumbnail.target_id, 'version': thumbnail.version, 'state': thumbnail.state.value}
+
+def rebuild_thumbnail(data: dict) -> Union[Thumbnail, UniverseThumbnails]:
+	return UniverseThumbnails(data) if 'universeId' in data else Thumbnail(data)
+
+class ThumbnailQuery:
+	# one kind of thumbnail (endpoint plus type, size, format, circular...), targets of the same kind can share requests
+	__slots__ = ('path', 'ids_param', 'params', 'thumbnail_class', 'key', 'cache_key')
+	
+	def __init__(self, path: str, ids_param: str, params: dict, thumbnail_class: type = Thumbnail, key: Callable = lambda thumbnail: thumbnail.target_id) -> None:
+		self.path = path
+		self.ids_param = ids_param
+		self.params = params
+		self.thumbnail_class = thumbnail_class
+		self.key = key
+		
+		self.cache_key = (path, tuple(params.items()))
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.path} {self.params}>'
+
+class _PendingTargets:
+	def __init__(self, query: ThumbnailQuery) -> None:
+		self.query = query
+		
+		# target id -> [future, how many times it's been polled]
+		self.targets: dict[int, list] = {}
+
+class ThumbnailResolver:
+	# fetches thumbnails, answering from the client's 'thumbnails' cache where it can, then keeps polling the ones
+	# still pending with backoff. pending targets of the same kind from every caller wait in one pool and get polled
+	# together by a single poller, so a hundred callers waiting on avatars is still one request per poll
+	def __init__(
+			self,
+			client: Client,
+			max_polls: int = THUMBNAIL_MAX_POLLS,
+			poll_delay: float = THUMBNAIL_POLL_DELAY,
+			max_poll_delay: float = THUMBNAIL_MAX_POLL_DELAY
+		) -> None:
+		
+		self.client = client
+		
+		self.max_polls = max_polls
+		self.poll_delay = poll_delay
+		self.max_poll_delay = max_poll_delay
+		
+		self.pending: dict[tuple, _PendingTargets] = {}
+		
+		self._lock = Lock()
+	
+	def get_poll_delay(self, poll_count: int) -> float:
+		return min(self.poll_delay * 2 ** poll_count, self.max_poll_delay)
+	
+	def _get_cached(self, query: ThumbnailQuery, target_ids: list[int]) -> tuple[list, list[int]]:
+		client = self.client
+		
+		if not client.config.cache_thumbnails:
+			return [], list(dict.fromkeys(target_ids))
+		
+		found = []
+		missing = []
+		
+		for target_id in dict.fromkeys(target_ids):
+			thumbnail = client.get_cache('thumbnails', (query.cache_key, target_id), MISSING)
+			
+			if thumbnail is MISSING:
+				missing.append(target_id)
+			else:
+				found.append(thumbnail)
+		
+		return found, missing
+	
+	def _store(self, query: ThumbnailQuery, thumbnails: list) -> list:
+		# only finished thumbnails are worth keeping
+		client = self.client
+		
+		if not client.config.cache_thumbnails:
+			return thumbnails
+		
+		for thumbnail in thumbnails:
+			if thumbnail.is_completed:
+				client.set_cache('thumbnails', (query.cache_key, query.key(thumbnail)), thumbnail)
+		
+		return thumbnails
+	
+	def _fetch(self, query: ThumbnailQuery, target_ids: list[int], is_poll: bool = False):
+		client = self.client
+		
+		# polls have to reach roblox, a pending response could still be fresh in the http cache or shared with an
+		# identical request in flight, and passing headers skips both
+		extra = {'headers': {'Cache-Control': 'no-cache'}} if is_poll else {}
+		
+		def handle(result):
+			thumbnail_data, _ = result
+			
+			return [
+				query.thumbnail_class(data)
+				for data in thumbnail_data['data']
+			]
+		
+		def get_chunk(chunk: list[int]):
+			return chain(handle, client.fetcher.get(
+				url=client.url_generator.get_url('thumbnails', query.path),
+				params={
+					query.ids_param: chunk,
+					**query.params
+				},
+				**extra
+			))
+		
+		return chain(lambda thumbnails: self._store(query, thumbnails), client.fetcher.map_chunks(target_ids, THUMBNAIL_BATCH_SIZE, get_chunk, key=query.key))
+	
+	def _join(self, query: ThumbnailQuery, target_ids: list[int], new_future: Callable) -> tuple[_PendingTargets, list, bool]:
+		# returns the pool, the caller's futures and whether the pool needs a poller started
+		with self._lock:
+			pool = self.pending.get(query.cache_key)
+			needs_poller = pool is None
+			
+			if needs_poller:
+				pool = self.pending[query.cache_key] = _PendingTargets(query)
+			
+			futures = []
+			
+			for target_id in target_ids:
+				target = pool.targets.get(target_id)
+				
+				if target is None:
+					target = pool.targets[target_id] = [new_future(), 0]
+				
+				futures.append(target[0])
+		
+		return pool, futures, needs_poller
+	
+	def _next_poll(self, pool: _PendingTargets) -> Optional[tuple[list[int], float]]:
+		# the targets to poll next and how long to wait first, or None once the pool is empty and has been closed
+		with self._lock:
+			if not pool.targets:
+				del self.pending[pool.query.cache_key]
+				
+				return
+			
+			poll_count = min(polls for _, polls in pool.targets.values())
+			
+			return list(pool.targets), self.get_poll_delay(poll_count)
+	
+	def _handle_poll(self, pool: _PendingTargets, target_ids: list[int], thumbnails: list):
+		key = pool.query.key
+		by_id = {key(thumbnail): thumbnail for thumbnail in thumbnails}
+		
+		with self._lock:
+			for target_id in target_ids:
+				target = pool.targets[target_id]
+				target[1] += 1
+				
+				thumbnail = by_id.get(target_id)
+				
+				# anything out of polls gets handed back still pending
+				if thumbnail is None or not thumbnail.is_pending or target[1] >= self.max_polls:
+					del pool.targets[target_id]
+					target[0].set_result(thumbnail)
+	
+	def _fail_poll(self, pool: _PendingTargets, target_ids: list[int], error: BaseException):
+		with self._lock:
+			for target_id in target_ids:
+				future, _ = pool.targets.pop(target_id)
+				future.set_exception(error)
+	
+	def _poll(self, pool: _PendingTargets):
+		while True:
+			poll = self._next_poll(pool)
+			
+			if poll is None:
+				return
+			
+			target_ids, delay = poll
+			sleep(delay)
+			
+			try:
+				thumbnails = self._fetch(pool.query, target_ids, is_poll=True)
+			except Exception as error:
+				self._fail_poll(pool, target_ids, error)
+			else:
+				self._handle_poll(pool, target_ids, thumbnails)
+	
+	def _wait_for_pending(self, query: ThumbnailQuery, target_ids: list[int]) -> list:
+		pool, futures, needs_poller = self._join(query, target_ids, Future)
+		
+		if needs_poller:
+			Thread(target=self._poll, args=(pool,), daemon=True).start()
+		
+		return [future.result() for future in futures]
+	
+	def _split_pending(self, query: ThumbnailQuery, thumbnails: list, wait_for_pending: bool) -> tuple[list, list[int]]:
+		# splits off the pending thumbnails that still need waiting on
+		if not wait_for_pending:
+			return thumbnails, []
+		
+		done = [thumbnail for thumbnail in thumbnails if not thumbnail.is_pending]
+		pending_ids = [query.key(thumbnail) for thumbnail in thumbnails if thumbnail.is_pending]
+		
+		return done, pending_ids
+	
+	def resolve(self, query: ThumbnailQuery, targets: list, wait_for_pending: bool = False) -> list:
+		target_ids = list(map(int, targets))
+		thumbnails, missing = self._get_cached(query, target_ids)
+		
+		if missing:
+			thumbnails += self._fetch(query, missing)
+		
+		thumbnails, pending_ids = self._split_pending(query, thumbnails, wait_for_pending)
+		
+		if pending_ids:
+			thumbnails += [thumbnail for thumbnail in self._wait_for_pending(query, pending_ids) if thumbnail is not None]
+		
+		return order_results(thumbnails, target_ids, query.key)
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {sum(len(pool.targets) for pool in self.pending.values())} pending>'
+
+class AsyncThumbnailResolver(ThumbnailResolver):
+	def __init__(self, *args, **kwargs) -> None:
+		super().__init__(*args, **kwargs)
+		
+		# the event loop only holds weak references to tasks, so the pollers are kept here until they finish
+		self._pollers = set()
+	
+	async def _poll(self, pool: _PendingTargets):
+		while True:
+			poll = self._next_poll(pool)
+			
+			if poll is None:
+				return
+			
+			target_ids, delay = poll
+			await asyncio.sleep(delay)
+			
+			try:
+				thumbnails = await self._fetch(pool.query, target_ids, is_poll=True)
+			except Exception as error:
+				self._fail_poll(pool, target_ids, error)
+			else:
+				self._handle_poll(pool, target_ids, thumbnails)
+	
+	async def _wait_for_pending(self, query: ThumbnailQuery, target_ids: list[int]) -> list:
+		pool, futures, needs_poller = self._join(query, target_ids, asyncio.get_running_loop().create_future)
+		
+		if needs_poller:
+			poller = asyncio.ensure_future(self._poll(pool))
+			
+			self._pollers.add(poller)
+			poller.add_done_callback(self._pollers.discard)
+		
+		return await asyncio.gather(*futures)
+	
+	async def resolve(self, query: ThumbnailQuery, targets: list, wait_for_pending: bool = False) -> list:
+		target_ids = list(map(int, targets))
+		thumbnails, missing = self._get_cached(query, target_ids)
+		
+		if missing:
+			thumbnails += await self._fetch(query, missing)
+		
+		thumbnails, pending_ids = self._split_pending(query, thumbnails, wait_for_pending)
+		
+		if pending_ids:
+			thumbnails += [thumbnail for thumbnail in await self._wait_for_pending(query, pending_ids) if thumbnail is not None]
+		
+		return order_results(thumbnails, target_ids, query.key)
 
 class ThumbnailProvider(BaseProvider):
+	resolver_class = ThumbnailResolver
+	
+	def __init__(self, client: Client) -> None:
+		super().__init__(client)
+		
+		self.resolver = self.resolver_class(client)
+	
+	# pending thumbnails get handed back as is unless asked to wait, since waiting can take up to the whole polling backoff
+	def _get_thumbnails(self, path: str, ids_param: str, targets: list, params: dict, wait_for_pending: bool = False, thumbnail_class: type = Thumbnail, key: Callable = lambda thumbnail: thumbnail.target_id):
+		return self.resolver.resolve(ThumbnailQuery(path, ids_param, params, thumbnail_class, key), targets, wait_for_pending)
+	
+	def _load_thumbnail(self, bulk_method, target: int, **options) -> Thumbnail:
+		return self.client.batcher.load(bulk_method, int(target), key=lambda thumbnail: thumbnail.target_id, **options)
+	
+	def get_outfit_thumbnail(self, outfit: OutfitOrId, size: OutfitThumbnailSize = OutfitThumbnailSize.Normal, is_circular: bool = False, format: ThumbnailFormat = ThumbnailFormat.Png, wait_for_pending: bool = False):
+		return self._load_thumbnail(self.get_outfit_thumbnails, outfit, size=size, is_circular=is_circular, format=format, wait_for_pending=wait_for_pending)
+	
+	def get_badge_icon(self, badge: BadgeOrId, is_circular: bool = False, format: ThumbnailFormat = ThumbnailFormat.Png, wait_for_pending: bool = False):
+		return self._load_thumbnail(self.get_badge_icons, badge, is_circular=is_circular, format=format, wait_for_pending=wait_for_pending)
+	
+	def get_place_icon(self, place: PlaceOrId, size: PlaceThumbnailSize = PlaceThumbnailSize.Medium, policy: PlaceThumbnailPolicy = PlaceThumbnailPolicy.Placeholder, is_circular: bool = False, format: ThumbnailFormat = ThumbnailFormat.Png, wait_for_pending: bool = False):
+		return self._load_thumbnail(self.get_places_icons, place, size=size, policy=policy, is_circular=is_circular, format=format, wait_for_pending=wait_for_pending)
+	
+	def get_user_thumbnail(self, user: UserOrId, type: UserThumbnailType = UserThumbnailType.FullBody, size: UserThumbnailSize = UserThumbnailSize.Medium, is_circular: bool = False, format: ThumbnailFormat = ThumbnailFormat.Png, wait_for_pending: bool = False):
+		return self._load_thumbnail(self.get_user_thumbnails, user, type=type, size=size, is_circular=is_circular, format=format, wait_for_pending=wait_for_pending)
+	
 	def get_outfit_thumbnails(
 			self,
 			outfits: list[OutfitOrId],
 			size: OutfitThumbnailSize = OutfitThumbnailSize.Normal,
 			is_circular: bool = False,
-			format: ThumbnailFormat = ThumbnailFormat.Png
+			format: ThumbnailFormat = ThumbnailFormat.Png,
+			wait_for_pending: bool = False
 		):
-		client = self.client
-		
-		thumbnail_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('thumbnails', 'v1/users/outfits'),
+		return self._get_thumbnails(
+			path='v1/users/outfits',
+			ids_param='userOutfitIds',
+			targets=outfits,
+			wait_for_pending=wait_for_pending,
 			params={
-				'userOutfitIds': list(map(int, outfits)),
 				'isCircular': is_circular,
 				'size': size.value,
 				'format': format.value
 			}
 		)
-		
-		return [
-			Thumbnail(data)
-			for data in thumbnail_data['data']
-		]
 	
 	def get_badge_icons(
 			self,
 			badges: list[BadgeOrId],
 			is_circular: bool = False,
-			format: ThumbnailFormat = ThumbnailFormat.Png
+			format: ThumbnailFormat = ThumbnailFormat.Png,
+			wait_for_pending: bool = False
 		):
 		
-		client = self.client
-		
-		thumbnail_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('thumbnails', 'v1/badges/icons'),
+		return self._get_thumbnails(
+			path='v1/badges/icons',
+			ids_param='badgeIds',
+			targets=badges,
+			wait_for_pending=wait_for_pending,
 			params={
-				'badgeIds': list(map(int, badges)),
 				'size': '150x150',
 				'isCircular': is_circular,
 				'format': format.value
 			}
 		)
-		
-		return [
-			Thumbnail(data)
-			for data in thumbnail_data['data']
-		]
 	
 	def get_places_icons(
 			self,
@@ -83,26 +409,22 @@ class ThumbnailProvider(BaseProvider):
 			size: PlaceThumbnailSize = PlaceThumbnailSize.Medium,
 			policy: PlaceThumbnailPolicy = PlaceThumbnailPolicy.Placeholder,
 			is_circular: bool = False,
-			format: ThumbnailFormat = ThumbnailFormat.Png
+			format: ThumbnailFormat = ThumbnailFormat.Png,
+			wait_for_pending: bool = False
 		):
 		
-		client = self.client
-		
-		thumbnail_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('thumbnails', 'v1/places/gameicons'),
+		return self._get_thumbnails(
+			path='v1/places/gameicons',
+			ids_param='placeIds',
+			targets=places,
+			wait_for_pending=wait_for_pending,
 			params={
-				'placeIds': list(map(int, places)),
 				'isCircular': is_circular,
 				'returnPolicy': policy.value,
 				'size': size.value,
 				'format': format.value
 			}
 		)
-		
-		return [
-			Thumbnail(data)
-			for data in thumbnail_data['data']
-		]
 	
 	def get_user_thumbnails(
 			self,
@@ -110,25 +432,21 @@ class ThumbnailProvider(BaseProvider):
 			type: UserThumbnailType = UserThumbnailType.FullBody,
 			size: UserThumbnailSize = UserThumbnailSize.Medium,
 			is_circular: bool = False,
-			format: ThumbnailFormat = ThumbnailFormat.Png
+			format: ThumbnailFormat = ThumbnailFormat.Png,
+			wait_for_pending: bool = False
 		):
 		
-		client = self.client
-		
-		thumbnail_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('thumbnails', f'v1/users/{type.value}'),
+		return self._get_thumbnails(
+			path=f'v1/users/{type.value}',
+			ids_param='userIds',
+			targets=users,
+			wait_for_pending=wait_for_pending,
 			params={
-				'userIds': users,
 				'isCircular': is_circular,
 				'size': size.value,
 				'format': format.value
 			}
 		)
-		
-		return [
-			Thumbnail(data)
-			for data in thumbnail_data['data']
-		]
 	
 	def get_universe_thumbnails(
 			self,
@@ -137,24 +455,25 @@ class ThumbnailProvider(BaseProvider):
 			is_circular: bool = False,
 			count_per_universe: int = 1,
 			defaults: bool = True,
-			format: ThumbnailFormat = ThumbnailFormat.Png
+			format: ThumbnailFormat = ThumbnailFormat.Png,
+			wait_for_pending: bool = False
 		):
 		
-		client = self.client
-		
-		thumbnail_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('thumbnails', 'v1/games/multiget/thumbnails'),
+		return self._get_thumbnails(
+			path='v1/games/multiget/thumbnails',
+			ids_param='universeIds',
+			targets=universes,
+			wait_for_pending=wait_for_pending,
 			params={
-				'universeIds': list(map(int, universes)),
 				'countPerUniverse': count_per_universe,
 				'defaults': defaults,
 				'isCircular': is_circular,
 				'size': size.value,
 				'format': format.value
-			}
+			},
+			thumbnail_class=UniverseThumbnails,
+			key=lambda container: container.universe_id
 		)
-		
-		return [
-			UniverseThumbnails(data)
-			for data in thumbnail_data['data']
-		]
\ No newline at end of file
+
+class AsyncThumbnailProvider(ThumbnailProvider):
+	resolver_class = AsyncThumbnailResolver
\ No newline at end of file
@@ -1,62 +1,96 @@
 # https://users.roblox.com/docs/index.html
 
+from typing import Optional
+
 from ..classes.users import User, BaseUser, PartialUser, AuthenticatedUser
 
 from .baseprovider import BaseProvider
-from dateutil.parser import parse
+from .friends import FriendCrawler
+from ..utility.awaitables import chain
+from ..utility.fetcher import get_status_code
+from ..utility.chunking import order_results
+from ..exceptions import NotFoundError
+from ..utility.timestamps import parse_timestamp
+
+USERS_BATCH_SIZE = 100
+BADGE_DATES_BATCH_SIZE = 100
 
 class UserBadgeDateData:
+	__slots__ = ('badge_id', 'awarded_date')
+	
 	def __init__(self, data: dict) -> None:
 		self.badge_id = data.get('badgeId', 0)
-		self.awarded_date = parse(data.get('awardedDate')).timestamp()
+		self.awarded_date = parse_timestamp(data.get('awardedDate'))
 
 class UserProvider(BaseProvider):
 	def multiget_users_usernames(self, usernames: list[str], exclude_banned: bool = True) -> list[PartialUser]:
 		client = self.client
 		
-		users_data, _ = client.fetcher.post(
-			url=client.url_generator.get_url('users', 'v1/usernames/users'),
-			payload={
-				'usernames': usernames,
-				'excludeBannedUsers': exclude_banned
-			}
-		)
+		def get_chunk(chunk: list[str]):
+			def handle(result):
+				users_data, _ = result
+				
+				# sort before building the users, the requested username is only in the raw data
+				return [
+					PartialUser(client=client, data=data)
+					for data in order_results(users_data['data'], chunk, key=lambda data: data.get('requestedUsername'))
+				]
+			
+			return chain(handle, client.fetcher.post(
+				url=client.url_generator.get_url('users', 'v1/usernames/users'),
+				payload={
+					'usernames': chunk,
+					'excludeBannedUsers': exclude_banned
+				}
+			))
 		
-		return [
-			PartialUser(client=client, data=data)
-			for data in users_data['data']
-		]
+		return client.fetcher.map_chunks(list(usernames), USERS_BATCH_SIZE, get_chunk)
 	
 	def multiget_users_ids(self, user_ids: list[int], exclude_banned: bool = True) -> list[PartialUser]:
 		client = self.client
 		
-		users_data, _ = client.fetcher.post(
-			url=client.url_generator.get_url('users', 'v1/users'),
-			payload={
-				'userIds': user_ids,
-				'excludeBannedUsers': exclude_banned
-			}
-		)
+		def get_chunk(chunk: list[int]):
+			def handle(result):
+				users_data, _ = result
+				
+				return [
+					PartialUser(client=client, data=data)
+					for data in users_data['data']
+				]
+			
+			return chain(handle, client.fetcher.post(
+				url=client.url_generator.get_url('users', 'v1/users'),
+				payload={
+					'userIds': chunk,
+					'excludeBannedUsers': exclude_banned
+				}
+			))
 		
-		return [
-			PartialUser(client=client, data=data)
-			for data in users_data['data']
-		]
+		return client.fetcher.map_chunks(list(map(int, user_ids)), USERS_BATCH_SIZE, get_chunk, key=lambda user: user.id)
 	
 	def get_badge_awarded_dates(self, user_id: int, badge_ids: list[int]):
 		client = self.client
 		
-		date_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('badges', f'v1/users/{user_id}/badges/awarded-dates'),
-			params={
-				'badgeIds': badge_ids
-			}
-		)
+		def get_chunk(chunk: list[int]):
+			def handle(result):
+				date_data, _ = result
+				
+				return [
+					UserBadgeDateData(data)
+					for data in date_data['data']
+				]
+			
+			return chain(handle, client.fetcher.get(
+				url=client.url_generator.get_url('badges', f'v1/users/{user_id}/badges/awarded-dates'),
+				params={
+					'badgeIds': chunk
+				}
+			))
 		
-		return [
-			UserBadgeDateData(data)
-			for data in date_data['data']
-		]
+		return client.fetcher.map_chunks(list(map(int, badge_ids)), BADGE_DATES_BATCH_SIZE, get_chunk, key=lambda date_data: date_data.badge_id)
+	
+	def crawl_friends(self, seeds: list[int], max_depth: int = 2, max_nodes: Optional[int] = None, max_workers: int = 8, skip_errors: bool = False) -> FriendCrawler:
+		return FriendCrawler(self.client, seeds, max_depth=max_depth, max_nodes=max_nodes, max_workers=max_workers, skip_errors=skip_errors)
 	
 	def get_base_user(self, user_id: int) -> BaseUser:
 		return BaseUser(client=self.client, id=user_id)
@@ -64,23 +98,33 @@ class UserProvider(BaseProvider):
 	def get_user(self, user_id: int) -> User:
 		client = self.client
 		
-		user_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('users', f'v1/users/{user_id}')
-		)
+		def handle(result):
+			user_data, response = result
+			
+			if get_status_code(response) == 404:
+				client.mark_missing('users', user_id)
+				
+				raise NotFoundError('users', user_id)
+			
+			return User(client=client, data=user_data)
 		
-		return User(client=client, data=user_data)
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('users', f'v1/users/{user_id}')
+		))
 	
 	def get_authenticated_user(self, full: bool = True):
 		client = self.client
 		
-		user_data, _ = client.fetcher.get(
-			url=client.url_generator.get_url('users', 'v1/users/authenticated')
-		)
-		
-		if full:
+		def handle(result):
+			user_data, _ = result
+			
+			if not full:
+				return BaseUser(client, user_data['id'])
+			
 			authenticated_user = AuthenticatedUser(client, user_data)
-			authenticated_user.update_info()
 			
-			return authenticated_user
+			return chain(lambda _: authenticated_user, authenticated_user.update_info())
 		
-		return BaseUser(client, user_data['id'])
\ No newline at end of file
+		return chain(handle, client.fetcher.get(
+			url=client.url_generator.get_url('users', 'v1/users/authenticated')
+		))
\ No newline at end of file
@@ -8,15 +8,29 @@ from .classes.users import User, BaseUser, PartialUser, AuthenticatedUser, Frien
 from .classes.assets import Asset, BaseAsset
 
 from .utility.fetcher import Fetcher, Page, Pages, PageIterator
+from .utility.asyncfetcher import AsyncFetcher, AsyncPageIterator
 from .utility.url import URLGenerator
+from .utility.ratelimit import RateLimit, RateLimiter, TokenBucket
+from .utility.retry import RetryPolicy, RetryBudget
+from .utility.singleflight import SingleFlight, AsyncSingleFlight
+from .utility.batching import Batcher, AsyncBatcher
+from .utility.httpcache import HTTPCache
+from .utility.persistentcache import SQLiteCache
+from .utility.cache import LRUCache, CacheStats, MISSING
+from .utility.columnar import ColumnarBuilder, NpyAppender
+from .utility.scheduler import PageScheduler
+from .utility.pagesizes import MAX_PAGE_SIZE
+from .utility.idset import IdSet
 
 from .services.economy import EconomyProvider
 from .services.inventory import InventoryProvider
-from .services.presence import PresenceProvider, Presence
-from .services.thumbnail import ThumbnailProvider, Thumbnail, UniverseThumbnails
+from .services.presence import PresenceProvider, Presence, PresenceWatcher, PresenceChange
+from .services.thumbnail import ThumbnailProvider, AsyncThumbnailProvider, Thumbnail, UniverseThumbnails, ThumbnailQuery, ThumbnailResolver, AsyncThumbnailResolver
 from .services.avatar import Outfit
+from .services.friends import FriendCrawler, FriendGraph
 
-from .client import Client, ClientConfig
+from .client import Client, AsyncClient, ClientConfig
+from .exceptions import NotFoundError, PageError
 
 UserOrId = Union[BaseUser, int]
 PlaceOrId = Union[BasePlace, int]
@@ -0,0 +1,326 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from asyncio import sleep, gather, Semaphore, Queue, ensure_future
+
+from .fetcher import Page, Pages, PageIterator, get_next_cursor, END_OF_PAGES
+from .singleflight import AsyncSingleFlight, make_request_key
+from .chunking import chunked, order_results
+from .httpcache import HTTPCache
+from .columnar import get_columnar_builder
+
+if TYPE_CHECKING:
+	import aiohttp
+	
+	from ..client import Client
+
+# only the async client needs aiohttp and it's slow to import, so the first AsyncFetcher imports it
+aiohttp = None
+
+def _import_aiohttp():
+	global aiohttp
+	
+	if aiohttp is None:
+		try:
+			import aiohttp as aiohttp_module
+		except ImportError:
+			raise ImportError('AsyncFetcher requires aiohttp, install it with `pip install api2[async]`') from None
+		
+		aiohttp = aiohttp_module
+
+class AsyncPageIterator(PageIterator):
+	async def getAllPages(self, page_limit: int = 5, prefetch: int = 0):
+		async for _ in self.iterPages(max_pages=max(page_limit - self.current_page_index, 0), keep_pages=True, prefetch=prefetch):
+			pass
+		
+		return Pages(self.cached_pages)
+	
+	async def getCurrentPage(self) -> Page:
+		page_data = await self._fetch_page_data()
+		
+		return self._handle_page_data(page_data)
+	
+	async def _get_next_page(self, keep_page: bool = True) -> Page:
+		page_data = await self._fetch_page_data()
+		page = self._make_page(self._get_unhandled_data(page_data), keep_page)
+		
+		self._advance()
+		
+		return page
+	
+	async def _fetch_page_data(self, cursor: Optional[str] = None) -> dict:
+		while True:
+			page_data, response = await self.fetcher.get(self.url, params=self._get_params(cursor))
+			
+			if not self._step_down_page_size(page_data, response):
+				return self._check_page_data(page_data, response)
+	
+	async def getAllColumns(self, fields: dict, page_limit: int = 5, path: Optional[str] = None, prefetch: int = 0):
+		builder = get_columnar_builder(fields, path)
+		page_datas = self._fetch_pages(max(page_limit - self.current_page_index, 0), prefetch)
+		
+		try:
+			async for page_data in page_datas:
+				builder.add_page(self._get_unhandled_data(page_data))
+				self.advanceToNextPage()
+		finally:
+			await page_datas.aclose()
+			builder.close()
+		
+		return builder.finish()
+	
+	async def iterPages(self, max_pages: Optional[int] = None, max_items: Optional[int] = None, keep_pages: bool = False, prefetch: int = 0):
+		item_count = 0
+		
+		if not self._is_within_limits(0, item_count, max_pages, max_items):
+			return
+		
+		page_datas = self._fetch_pages(max_pages, prefetch)
+		
+		try:
+			async for page_data in page_datas:
+				data = self._take_page_data(page_data, item_count, max_items)
+				
+				item_count += len(data)
+				
+				yield self._make_page(data, keep_pages)
+				
+				self._page_handled()
+				
+				if max_items is not None and item_count >= max_items:
+					return
+		finally:
+			await page_datas.aclose()
+	
+	async def iterItems(self, max_items: Optional[int] = None, max_pages: Optional[int] = None, keep_pages: bool = False, prefetch: int = 0):
+		async for page in self.iterPages(max_pages=max_pages, max_items=max_items, keep_pages=keep_pages, prefetch=prefetch):
+			for item in page.data:
+				yield item
+	
+	async def _walk_pages(self, max_pages: Optional[int] = None):
+		if self.is_finished:
+			return
+		
+		cursor = self.page_cursor
+		page_count = 0
+		
+		while max_pages is None or page_count < max_pages:
+			page_data = await self._fetch_page_data(cursor)
+			page_count += 1
+			
+			yield page_data
+			
+			cursor = get_next_cursor(page_data)
+			
+			if not cursor:
+				return
+	
+	async def _prefetch_pages(self, max_pages: Optional[int], prefetch: int):
+		pages = Queue(maxsize=prefetch)
+		
+		async def produce():
+			try:
+				async for page_data in self._walk_pages(max_pages):
+					await pages.put((page_data, None))
+				
+				await pages.put((END_OF_PAGES, None))
+			except Exception as error:
+				await pages.put((None, error))
+		
+		producer = ensure_future(produce())
+		
+		try:
+			while True:
+				page_data, error = await pages.get()
+				
+				if error is not None:
+					raise error
+				
+				if page_data is END_OF_PAGES:
+					return
+				
+				yield page_data
+		finally:
+			producer.cancel()
+	
+	def __iter__(self):
+		raise TypeError(f'{self.__class__.__name__} has to be iterated with async for')
+	
+	def __aiter__(self):
+		return self.iterItems()
+
+
+def _encode_params(params: dict = None):
+	# aiohttp is a lot stricter than requests, so mirror how requests would encode these
+	if not params:
+		return None
+	
+	encoded = []
+	
+	for key, value in params.items():
+		values = value if isinstance(value, (list, tuple)) else [value]
+		
+		for item in values:
+			if item is None:
+				continue
+			
+			encoded.append((key, item if isinstance(item, str) else str(item)))
+	
+	return encoded
+
+class AsyncFetcher:
+	page_iterator_class = AsyncPageIterator
+	
+	def __init__(self, client: Client, session: aiohttp.ClientSession = None, xcsrf_token_name: str = 'X-CSRF-Token'):
+		_import_aiohttp()
+		
+		self.client = client
+		self.session = session
+		
+		self.headers = {}
+		self.cookies = {}
+		
+		self.xcsrf_token_name = xcsrf_token_name
+		
+		self.in_flight = AsyncSingleFlight()
+		self.http_cache = HTTPCache(client.config.http_cache_size) if client.config.http_cache_size > 0 else None
+		
+		self.set_header('Content-Type', 'application/json')
+		self.set_header('User-Agent', 'Roblox/WinInet')
+		self.set_header('Referer', 'https://www.roblox.com/')
+	
+	def _get_session(self) -> aiohttp.ClientSession:
+		# the session has to be made inside of a running event loop
+		if self.session is None or self.session.closed:
+			self.session = aiohttp.ClientSession(cookies=self.cookies)
+		
+		return self.session
+	
+	def set_header(self, header: str, value: Any):
+		self.headers[header] = value
+	
+	def set_cookie(self, name: str, value: Any):
+		self.cookies[name] = value
+		
+		if self.session is not None:
+			self.session.cookie_jar.update_cookies({name: value})
+	
+	async def close(self):
+		if self.session is not None:
+			await self.session.close()
+	
+	async def wait_for_rate_limit(self, url: str):
+		client = self.client
+		delay = client.config.rate_limiter.reserve(client.url_generator.get_subdomain(url))
+		
+		if delay > 0:
+			await sleep(delay)
+	
+	def decode(self, body: bytes) -> Any:
+		# aiohttp treats an empty body as null instead of failing, keep doing that
+		if not body.strip():
+			return
+		
+		return self.client.config.decode_json(body)
+	
+	async def _send_once(self, method: str, url: str, params: dict = None, headers: dict = None, *args, **kwargs) -> tuple[aiohttp.ClientResponse, bytes]:
+		session = self._get_session()
+		
+		await self.wait_for_rate_limit(url)
+		
+		async with session.request(method, url, params=_encode_params(params), headers={**self.headers, **(headers or {})}, *args, **kwargs) as response:
+			# read the body while the connection is still open so it can be decoded later on
+			return response, await response.read()
+	
+	async def _send(self, method: str, url: str, params: dict = None, *args, **kwargs) -> tuple[aiohttp.ClientResponse, bytes]:
+		config = self.client.config
+		retry_policy = config.retry_policy
+		
+		attempt = 0
+		refreshed_xcsrf = False
+		
+		while True:
+			retry_policy.budget.deposit()
+			
+			try:
+				response, body = await self._send_once(method, url, params, *args, **kwargs)
+			except aiohttp.ClientConnectionError as error:
+				if not retry_policy.should_retry(method, attempt, error=error):
+					raise
+				
+				if config._debug_print_requests:
+					print(f'{method} request: {url} ({error.__class__.__name__}), retrying')
+				
+				await sleep(retry_policy.get_delay(attempt))
+				attempt += 1
+				
+				continue
+			
+			if config._debug_print_requests:
+				print(f'{method} request: {url} ({response.status})')
+			
+			if response.status == 403 and self.xcsrf_token_name in response.headers and not refreshed_xcsrf:
+				self.set_header(self.xcsrf_token_name, response.headers.get(self.xcsrf_token_name))
+				refreshed_xcsrf = True
+				
+				continue
+			
+			if retry_policy.should_retry(method, attempt, status=response.status):
+				await sleep(retry_policy.get_delay(attempt, response.headers.get('Retry-After')))
+				attempt += 1
+				
+				continue
+			
+			return response, body
+	
+	async def request(self, method: str, url: str, params: dict = None, *args, **kwargs) -> tuple[dict, aiohttp.ClientResponse]:
+		http_cache = self.http_cache
+		
+		if http_cache is None or method != 'GET' or args or kwargs:
+			response, body = await self._send(method, url, params, *args, **kwargs)
+			
+			return self.decode(body), response
+		
+		cache_key = make_request_key(url, params)
+		entry = http_cache.get(cache_key) if cache_key is not None else None
+		
+		if entry is not None and entry.is_fresh:
+			return entry.data, entry.response
+		
+		response, body = await self._send(method, url, params, headers=entry.get_conditional_headers() if entry else None)
+		
+		if response.status == 304 and entry is not None:
+			http_cache.revalidate(cache_key, entry, response.headers)
+			
+			return entry.data, response
+		
+		data = self.decode(body)
+		
+		if cache_key is not None and response.status == 200:
+			http_cache.store(cache_key, response.headers, data, response)
+		
+		return data, response
+	
+	async def map_chunks(self, items: list, chunk_size: int, get_chunk: Callable[[list], Any], key: Optional[Callable] = None) -> list:
+		semaphore = Semaphore(self.client.config.max_chunk_workers)
+		
+		async def limited_get_chunk(chunk: list):
+			async with semaphore:
+				return await get_chunk(chunk)
+		
+		chunk_results = await gather(*[limited_get_chunk(chunk) for chunk in chunked(items, chunk_size)])
+		
+		return order_results([result for results in chunk_results for result in results], items, key)
+	
+	async def get(self, url: str, params: dict = None, *args, **kwargs) -> tuple[dict, aiohttp.ClientResponse]:
+		key = None
+		
+		if self.client.config.coalesce_requests and not args and not kwargs:
+			key = make_request_key(url, params)
+		
+		if key is None:
+			return await self.request("GET", url, params, *args, **kwargs)
+		
+		return await self.in_flight.do(key, lambda: self.request("GET", url, params))
+	
+	async def post(self, url: str, payload: dict = None, *args, **kwargs) -> tuple[dict, aiohttp.ClientResponse]:
+		return await self.request("POST", url, json=payload, *args, **kwargs)
\ No newline at end of file
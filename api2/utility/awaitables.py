@@ -0,0 +1,44 @@
+from __future__ import annotations
+from typing import Any, Callable
+from inspect import isawaitable, iscoroutinefunction
+from asyncio import gather
+
+def chain(callback: Callable, *results: Any):
+	# models are shared between Client and AsyncClient, so anything they get back from
+	# a provider might be an awaitable that still needs to be resolved before handling
+	if not any(isawaitable(result) for result in results):
+		return callback(*results)
+	
+	async def resolve():
+		pending = [result for result in results if isawaitable(result)]
+		resolved = iter(await gather(*pending))
+		
+		result = callback(*[next(resolved) if isawaitable(result) else result for result in results])
+		
+		# callbacks can chain on to another request themselves
+		if isawaitable(result):
+			return await result
+		
+		return result
+	
+	return resolve()
+
+def resolved(fetcher: Any, value: Any):
+	# for answers that didn't need a request, callers using an AsyncFetcher still expect something to await
+	if not iscoroutinefunction(fetcher.request):
+		return value
+	
+	async def resolve():
+		return value
+	
+	return resolve()
+
+def rejected(fetcher: Any, error: BaseException):
+	# same as resolved but for errors, async callers get it when they await instead of while building their calls
+	if not iscoroutinefunction(fetcher.request):
+		raise error
+	
+	async def reject():
+		raise error
+	
+	return reject()
\ No newline at end of file
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+from threading import Lock, Event
+from concurrent.futures import Future
+from asyncio import Event as AsyncEvent, TimeoutError as AsyncTimeoutError, wait_for, get_running_loop, ensure_future, shield
+
+from .awaitables import chain
+
+if TYPE_CHECKING:
+	from ..client import Client
+
+def _match_result(results: list, item_id: int, key: Callable[[Any], int]):
+	for result in results:
+		if key(result) == item_id:
+			return result
+
+class _Batch:
+	def __init__(self, event) -> None:
+		self.futures: dict[int, Any] = {}
+		self.full = event
+	
+	def resolve(self, results: list, key: Callable[[Any], int]):
+		by_id = {key(result): result for result in results}
+		
+		for item_id, future in self.futures.items():
+			if not future.done():
+				future.set_result(by_id.get(item_id))
+	
+	def fail(self, error: BaseException):
+		for future in self.futures.values():
+			if not future.done():
+				future.set_exception(error)
+
+class Batcher:
+	def __init__(self, client: Client, max_batch_size: int = 100) -> None:
+		self.client = client
+		self.max_batch_size = max_batch_size
+		
+		self.pending: dict[Hashable, _Batch] = {}
+		
+		self._lock = Lock()
+	
+	def _make_key(self, bulk_method: Callable, options: dict):
+		return (bulk_method, tuple(sorted(options.items())))
+	
+	def _join(self, batch_key: Hashable, item_id: int, new_batch: Callable[[], _Batch], new_future: Callable):
+		# returns the batch this item ended up in, the caller's future and whether it has to send the batch
+		with self._lock:
+			batch = self.pending.get(batch_key)
+			is_leader = batch is None
+			
+			if is_leader:
+				batch = self.pending[batch_key] = new_batch()
+			
+			future = batch.futures.get(item_id)
+			
+			if future is None:
+				future = batch.futures[item_id] = new_future()
+			
+			if len(batch.futures) >= self.max_batch_size:
+				del self.pending[batch_key]
+				batch.full.set()
+		
+		return batch, future, is_leader
+	
+	def _close(self, batch_key: Hashable, batch: _Batch):
+		with self._lock:
+			if self.pending.get(batch_key) is batch:
+				del self.pending[batch_key]
+	
+	def load(self, bulk_method: Callable, item_id: int, key: Callable[[Any], int], **options):
+		config = self.client.config
+		
+		if not config.batch_requests:
+			return chain(lambda results: _match_result(results, item_id, key), bulk_method([item_id], **options))
+		
+		batch_key = self._make_key(bulk_method, options)
+		batch, future, is_leader = self._join(batch_key, item_id, lambda: _Batch(Event()), Future)
+		
+		if is_leader:
+			# give other threads a moment to add their ids before sending everything in one go
+			batch.full.wait(config.batch_window)
+			self._close(batch_key, batch)
+			
+			try:
+				batch.resolve(bulk_method(list(batch.futures), **options), key)
+			except BaseException as error:
+				batch.fail(error)
+		
+		return future.result()
+
+class AsyncBatcher(Batcher):
+	def __init__(self, client: Client, max_batch_size: int = 100) -> None:
+		super().__init__(client, max_batch_size)
+		
+		# holds onto the dispatch tasks until they finish
+		self._dispatches = set()
+	
+	async def _dispatch(self, batch_key: Hashable, batch: _Batch, bulk_method: Callable, key: Callable[[Any], int], options: dict):
+		try:
+			await wait_for(batch.full.wait(), self.client.config.batch_window)
+		except AsyncTimeoutError:
+			pass
+		
+		self._close(batch_key, batch)
+		
+		try:
+			batch.resolve(await bulk_method(list(batch.futures), **options), key)
+		except BaseException as error:
+			batch.fail(error)
+	
+	async def load(self, bulk_method: Callable, item_id: int, key: Callable[[Any], int], **options):
+		config = self.client.config
+		
+		if not config.batch_requests:
+			return _match_result(await bulk_method([item_id], **options), item_id, key)
+		
+		batch_key = self._make_key(bulk_method, options)
+		batch, future, is_leader = self._join(batch_key, item_id, lambda: _Batch(AsyncEvent()), get_running_loop().create_future)
+		
+		if is_leader:
+			# sent from its own task so cancelling the leader doesn't leave the rest of the batch waiting forever
+			dispatch = ensure_future(self._dispatch(batch_key, batch, bulk_method, key, options))
+			
+			self._dispatches.add(dispatch)
+			dispatch.add_done_callback(self._dispatches.discard)
+		
+		# shielded since callers asking for the same id share a future
+		return await shield(future)
\ No newline at end of file
@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import Any, Hashable, Optional
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+class _Missing:
+	def __bool__(self) -> bool:
+		return False
+	
+	def __repr__(self) -> str:
+		return 'MISSING'
+
+# returned on a cache miss, so a cached None (or 0, or []) is still a hit
+MISSING = _Missing()
+
+class CacheStats:
+	def __init__(self) -> None:
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.expirations = 0
+	
+	@property
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		
+		return self.hits / lookups if lookups else 0
+	
+	def as_dict(self) -> dict[str, float]:
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'expirations': self.expirations,
+			'hit_rate': self.hit_rate
+		}
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.hits} hits, {self.misses} misses, {self.evictions} evictions>'
+
+class LRUCache:
+	def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None) -> None:
+		self.max_size = max_size
+		self.ttl = ttl
+		
+		self.entries: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+		self.stats = CacheStats()
+		
+		self._lock = Lock()
+	
+	def get(self, key: Hashable, default: Any = MISSING) -> Any:
+		with self._lock:
+			entry = self.entries.get(key)
+			
+			if entry is None:
+				self.stats.misses += 1
+				
+				return default
+			
+			value, expires = entry
+			
+			if expires is not None and expires <= monotonic():
+				del self.entries[key]
+				
+				self.stats.expirations += 1
+				self.stats.misses += 1
+				
+				return default
+			
+			self.entries.move_to_end(key)
+			self.stats.hits += 1
+			
+			return value
+	
+	def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+		ttl = self.ttl if ttl is None else ttl
+		
+		with self._lock:
+			self.entries[key] = (value, monotonic() + ttl if ttl is not None else None)
+			self.entries.move_to_end(key)
+			
+			if self.max_size is not None:
+				while len(self.entries) > self.max_size:
+					self.entries.popitem(last=False)
+					self.stats.evictions += 1
+	
+	def delete(self, key: Hashable):
+		with self._lock:
+			self.entries.pop(key, None)
+	
+	def clear(self):
+		with self._lock:
+			self.entries.clear()
+	
+	def __len__(self) -> int:
+		return len(self.entries)
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {len(self)}/{self.max_size}>'
\ No newline at end of file
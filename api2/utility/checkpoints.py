@@ -0,0 +1,21 @@
+from __future__ import annotations
+from typing import Optional
+import json
+import os
+
+def save_checkpoint(path: str, checkpoint: dict):
+	temp_path = f'{path}.tmp'
+	
+	# write then swap, so a crash halfway through never leaves a broken checkpoint behind
+	with open(temp_path, 'w') as file:
+		json.dump(checkpoint, file)
+	
+	os.replace(temp_path, path)
+
+def load_checkpoint(path: str) -> Optional[dict]:
+	# None when nothing has been saved there yet
+	if not os.path.exists(path):
+		return
+	
+	with open(path) as file:
+		return json.load(file)
\ No newline at end of file
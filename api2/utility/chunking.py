@@ -0,0 +1,17 @@
+from __future__ import annotations
+from typing import Any, Callable, Optional
+
+def chunked(items: list, chunk_size: int) -> list[list]:
+	return [items[index:index + chunk_size] for index in range(0, len(items), chunk_size)]
+
+def order_results(results: list, items: list, key: Optional[Callable[[Any], Any]] = None) -> list:
+	# servers don't promise to keep our order, so sort back into the order things were asked for
+	if key is None:
+		return results
+	
+	positions = {}
+	
+	for index, item in enumerate(items):
+		positions.setdefault(item, index)
+	
+	return sorted(results, key=lambda result: positions.get(key(result), len(items)))
\ No newline at end of file
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+from struct import pack
+import os
+
+if TYPE_CHECKING:
+	import numpy
+
+# numpy is only needed for columnar exports and is slow to import, so the first builder imports it
+numpy = None
+npy_format = None
+
+def _import_numpy():
+	global numpy, npy_format
+	
+	if numpy is None:
+		try:
+			import numpy as numpy_module
+			from numpy.lib import format as npy_format_module
+		except ImportError:
+			raise ImportError('columnar exports require numpy, install it with `pip install api2[numpy]`') from None
+		
+		numpy, npy_format = numpy_module, npy_format_module
+
+# extra room left in a .npy header so the row count can grow without moving the data
+HEADER_GROWTH_DIGITS = 21
+
+def _parse_fields(fields: dict[str, Union[Any, tuple]]) -> list[tuple[str, tuple[str], Any, Callable]]:
+	# each field is either just a dtype, or (path, dtype) / (path, dtype, convert) where path is dotted into the json
+	columns = []
+	
+	for name, spec in fields.items():
+		path, convert = name, None
+		
+		if isinstance(spec, tuple):
+			if len(spec) == 3:
+				path, spec, convert = spec
+			else:
+				path, spec = spec
+		
+		columns.append((name, tuple(path.split('.')), numpy.dtype(spec), convert))
+	
+	return columns
+
+def _get_fill(dtype: Any) -> Any:
+	# what a missing value turns into, numpy won't take None for most dtypes
+	if dtype.kind in 'fc':
+		return numpy.nan
+	
+	return numpy.zeros((), dtype=dtype).item()
+
+class ColumnarBuilder:
+	def __init__(self, fields: dict[str, Union[Any, tuple]]) -> None:
+		_import_numpy()
+		
+		self.columns = _parse_fields(fields)
+		self.dtype = numpy.dtype([(name, dtype) for name, _, dtype, _ in self.columns])
+		self.fills = [_get_fill(dtype) for _, _, dtype, _ in self.columns]
+		
+		self.arrays = []
+		self.count = 0
+	
+	def _get_row(self, item: Any) -> tuple:
+		# models get exported from the json they were built from
+		if not isinstance(item, dict):
+			item = getattr(item, 'raw', None)
+			
+			if item is None:
+				raise ValueError('can only export models that kept their raw data, turn keep_raw back on')
+		
+		row = []
+		
+		for (_, path, _, convert), fill in zip(self.columns, self.fills):
+			value = item
+			
+			for key in path:
+				value = value.get(key) if isinstance(value, dict) else None
+			
+			if value is None:
+				value = fill
+			elif convert is not None:
+				value = convert(value)
+			
+			row.append(value)
+		
+		return tuple(row)
+	
+	def add_page(self, items: list):
+		if not items:
+			return
+		
+		array = numpy.array([self._get_row(item) for item in items], dtype=self.dtype)
+		
+		self._write(array)
+		self.count += len(array)
+	
+	def _write(self, array: numpy.ndarray):
+		self.arrays.append(array)
+	
+	def close(self):
+		pass
+	
+	def finish(self) -> numpy.ndarray:
+		if not self.arrays:
+			return numpy.empty(0, dtype=self.dtype)
+		
+		array = numpy.concatenate(self.arrays) if len(self.arrays) > 1 else self.arrays[0]
+		self.arrays = []
+		
+		return array
+
+class NpyAppender(ColumnarBuilder):
+	# writes rows straight into a .npy file, appending to it if it's already there,
+	# the header is rewritten after every page so the file can always be loaded
+	def __init__(self, fields: dict[str, Union[Any, tuple]], path: str) -> None:
+		super().__init__(fields)
+		
+		self.path = path
+		self.file = None
+		self.header_size = 0
+		
+		if os.path.exists(path) and os.path.getsize(path) > 0:
+			self._open_existing()
+		else:
+			self.file = open(path, 'w+b')
+			self._write_header()
+	
+	def _make_header(self, pad_to: int = 0) -> bytes:
+		header = repr({'descr': npy_format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.count,)})
+		
+		if not pad_to:
+			# leave space for the count to grow and keep the data 64 byte aligned like numpy does
+			pad_to = 10 + len(header) + HEADER_GROWTH_DIGITS + 1
+			pad_to += -pad_to % 64
+		
+		header_length = pad_to - 10
+		
+		if len(header) + 1 > header_length or header_length > 0xFFFF:
+			raise ValueError(f'no room left in the header of {self.path!r} to update it')
+		
+		header = header.ljust(header_length - 1) + '\n'
+		
+		return npy_format.magic(1, 0) + pack('<H', header_length) + header.encode('latin1')
+	
+	def _write_header(self):
+		header = self._make_header(self.header_size)
+		self.header_size = len(header)
+		
+		self.file.seek(0)
+		self.file.write(header)
+		self.file.seek(0, os.SEEK_END)
+	
+	def _open_existing(self):
+		self.file = open(self.path, 'r+b')
+		
+		version = npy_format.read_magic(self.file)
+		
+		if version != (1, 0):
+			self.file.close()
+			
+			raise ValueError(f'can only append to version 1.0 .npy files, {self.path!r} is {version}')
+		
+		shape, fortran_order, dtype = npy_format.read_array_header_1_0(self.file)
+		
+		if dtype != self.dtype or fortran_order or len(shape) != 1:
+			self.file.close()
+			
+			raise ValueError(f'{self.path!r} holds {dtype} with shape {shape}, can\'t append {self.dtype} rows to it')
+		
+		self.header_size = self.file.tell()
+		self.count = shape[0]
+		
+		# anything after the last complete page is left over from a write that got cut off
+		self.file.truncate(self.header_size + self.count * self.dtype.itemsize)
+		self.file.seek(0, os.SEEK_END)
+	
+	def _write(self, array: numpy.ndarray):
+		self.file.write(array.tobytes())
+	
+	def add_page(self, items: list):
+		super().add_page(items)
+		
+		self._write_header()
+	
+	def close(self):
+		if self.file is not None and not self.file.closed:
+			self.file.flush()
+			self.file.close()
+	
+	def finish(self) -> numpy.ndarray:
+		self.close()
+		
+		if self.count == 0:
+			return numpy.empty(0, dtype=self.dtype)
+		
+		return numpy.load(self.path, mmap_mode='r')
+
+def get_columnar_builder(fields: dict[str, Union[Any, tuple]], path: Optional[str] = None) -> ColumnarBuilder:
+	return NpyAppender(fields, path) if path else ColumnarBuilder(fields)
\ No newline at end of file
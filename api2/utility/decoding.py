@@ -0,0 +1,41 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+import json
+
+JSONDecoder = Callable[[bytes], Any]
+
+def _get_orjson_decoder() -> JSONDecoder:
+	import orjson
+	
+	return orjson.loads
+
+def _get_msgspec_decoder() -> JSONDecoder:
+	import msgspec
+	
+	return msgspec.json.Decoder().decode
+
+def _get_stdlib_decoder() -> JSONDecoder:
+	return json.loads
+
+DECODERS = {
+	'orjson': _get_orjson_decoder,
+	'msgspec': _get_msgspec_decoder,
+	'json': _get_stdlib_decoder
+}
+
+def get_decoder(decoder: Union[str, JSONDecoder] = 'auto') -> JSONDecoder:
+	if callable(decoder):
+		return decoder
+	
+	if decoder != 'auto':
+		if decoder not in DECODERS:
+			raise ValueError(f'unknown json decoder {decoder!r}, expected one of {", ".join(DECODERS)} or auto')
+		
+		return DECODERS[decoder]()
+	
+	# fastest one that's installed wins
+	for get_backend in DECODERS.values():
+		try:
+			return get_backend()
+		except ImportError:
+			continue
\ No newline at end of file
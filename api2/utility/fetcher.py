@@ -1,16 +1,54 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Optional, Callable, Any
+from typing import TYPE_CHECKING, Optional, Callable, Any, Union
+from threading import Lock, Event, Thread
+from queue import Queue, Full
+from concurrent.futures import ThreadPoolExecutor
 
 from ..enums import SortOrder
+from ..exceptions import PageError
 from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.exceptions import ConnectionError as RequestsConnectionError
 from time import sleep
+from enum import Enum
+
+from .singleflight import SingleFlight, make_request_key
+from .chunking import chunked, order_results
+from .httpcache import HTTPCache
+from .columnar import get_columnar_builder
+from .pagesizes import MAX_PAGE_SIZE, get_allowed_page_sizes
+from .checkpoints import save_checkpoint, load_checkpoint
 
 if TYPE_CHECKING:
 	from ..client import Client
 
+# put on a prefetch queue once the cursor runs out
+END_OF_PAGES = object()
+
+def get_next_cursor(page_data: dict) -> Optional[str]:
+	return page_data.get('nextPageCursor', page_data.get('paginationToken'))
+
+def get_status_code(response: Any) -> int:
+	# requests calls it status_code, aiohttp calls it status
+	return getattr(response, 'status_code', None) or response.status
+
+def _is_page_size_error(page_data: Any) -> bool:
+	errors = page_data.get('errors') if isinstance(page_data, dict) else None
+	
+	for error in errors or []:
+		message = str(error.get('message', '') if isinstance(error, dict) else error).lower()
+		
+		if any(word in message for word in ('limit', 'itemsperpage', 'page size')):
+			return True
+	
+	return False
+
 class Page:
-	def __init__(self, page_data: list) -> None:
+	def __init__(self, page_data: list, raw_data: Optional[list] = None) -> None:
 		self.data = page_data
+		# the json the page's items were built from, None when the client has keep_raw off
+		self.raw_data = raw_data
 	
 	@property
 	def count(self):
@@ -32,6 +70,22 @@ class Pages:
 		
 		return data
 	
+	def get_columns(self, fields: dict, path: Optional[str] = None):
+		# same as PageIterator.getAllColumns, for pages that were already fetched, built from the page json
+		# since a handler's models don't always keep all of it
+		if any(page.raw_data is None for page in self.pages):
+			raise ValueError('pages fetched with keep_raw off have no json left to export, use PageIterator.getAllColumns instead')
+		
+		builder = get_columnar_builder(fields, path)
+		
+		try:
+			for page in self.pages:
+				builder.add_page(page.raw_data)
+		finally:
+			builder.close()
+		
+		return builder.finish()
+	
 	@property
 	def data_count(self):
 		count = 0
@@ -49,11 +103,20 @@ class Pages:
 		return f'<{self.__class__.__name__}>'
 
 class PageIterator:
+	def __new__(cls, fetcher: Fetcher = None, *args, **kwargs):
+		# lets models keep building PageIterators while an AsyncFetcher gets its own iterator type
+		iterator_class = getattr(fetcher, 'page_iterator_class', cls)
+		
+		if issubclass(iterator_class, cls):
+			cls = iterator_class
+		
+		return super().__new__(cls)
+	
 	def __init__(
 			self, 
 			fetcher: Fetcher,
 			url: str,
-			page_size: int,
+			page_size: Union[int, str],
 			sort_order: SortOrder = SortOrder.Ascending,
 			handler: Optional[Callable] = None,
 			**extra_params
@@ -62,7 +125,11 @@ class PageIterator:
 		self.fetcher = fetcher
 		self.url = url
 		self.sort_order = sort_order
-		self.page_size = page_size
+		# the limits the endpoint takes, 'max' picks the biggest and rejected sizes step down to the next one
+		self.allowed_page_sizes = get_allowed_page_sizes(url)
+		self.page_size = max(self.allowed_page_sizes) if page_size == MAX_PAGE_SIZE else page_size
+		# only a size picked from 'max' steps down on any 400, and only until a page comes back
+		self._negotiating_page_size = page_size == MAX_PAGE_SIZE
 		
 		self.current_page_index = 0
 		self.cached_pages = []
@@ -70,35 +137,320 @@ class PageIterator:
 		self.next_cursor = ''
 		self.prev_cursor = ''
 		self.page_cursor = ''
+		# how many items on the page at page_cursor were already handed out, when max_items cut it short
+		self.page_offset = 0
 		
 		self.handler = handler
 		self.extra_params = extra_params
 		
 		self.is_finished = False
+		
+		self.checkpoint_path = None
+		self.checkpoint_every = 1
+		self._pages_since_checkpoint = 0
+	
+	@classmethod
+	def fromCheckpoint(cls, fetcher: Fetcher, checkpoint: dict, handler: Optional[Callable] = None):
+		# for when the method that made the iterator isn't around anymore, enums in the params come back as their values
+		iterator = cls(
+			fetcher=fetcher,
+			url=checkpoint['url'],
+			page_size=checkpoint['page_size'],
+			sort_order=SortOrder(checkpoint['sort_order']),
+			handler=handler,
+			**checkpoint['extra_params']
+		)
+		
+		iterator.restoreCheckpoint(checkpoint)
+		
+		return iterator
+	
+	def getCheckpoint(self) -> dict:
+		return {
+			'url': self.url,
+			'page_size': self.page_size,
+			'sort_order': self.sort_order.value,
+			'extra_params': {key: value.value if isinstance(value, Enum) else value for key, value in self.extra_params.items()},
+			
+			'current_page_index': self.current_page_index,
+			'page_cursor': self.page_cursor,
+			'page_offset': self.page_offset,
+			'prev_cursor': self.prev_cursor,
+			'next_cursor': self.next_cursor,
+			'is_finished': self.is_finished
+		}
+	
+	def restoreCheckpoint(self, checkpoint: dict):
+		if checkpoint['url'] != self.url:
+			raise ValueError(f'checkpoint is for {checkpoint["url"]!r}, not {self.url!r}')
+		
+		self.page_size = checkpoint['page_size']
+		self.sort_order = SortOrder(checkpoint['sort_order'])
+		
+		self.current_page_index = checkpoint['current_page_index']
+		self.page_cursor = checkpoint['page_cursor']
+		self.page_offset = checkpoint.get('page_offset', 0)
+		self.prev_cursor = checkpoint['prev_cursor']
+		self.next_cursor = checkpoint['next_cursor']
+		self.is_finished = checkpoint['is_finished']
+		
+		return self
+	
+	def saveCheckpoint(self, path: Optional[str] = None):
+		save_checkpoint(path or self.checkpoint_path, self.getCheckpoint())
+		
+		self._pages_since_checkpoint = 0
+	
+	def setCheckpointFile(self, path: str, every: int = 1):
+		# picks up from the file if it's there, then saves to it every few pages once everything before is handled
+		self.checkpoint_path = path
+		self.checkpoint_every = every
+		
+		checkpoint = load_checkpoint(path)
+		
+		if checkpoint is not None:
+			self.restoreCheckpoint(checkpoint)
+		
+		return self
+	
+	def _page_handled(self):
+		if self.checkpoint_path is None:
+			return
+		
+		self._pages_since_checkpoint += 1
+		
+		if self._pages_since_checkpoint >= self.checkpoint_every or self.is_finished:
+			self.saveCheckpoint()
 	
-	def getAllPages(self, page_limit: int = 5):
-		while not self.is_finished and self.current_page_index < page_limit:
-			self.getCurrentPage()
-			self.advanceToNextPage()
+	def getAllPages(self, page_limit: int = 5, prefetch: int = 0):
+		for _ in self.iterPages(max_pages=max(page_limit - self.current_page_index, 0), keep_pages=True, prefetch=prefetch):
+			pass
 		
 		return Pages(self.cached_pages)
 	
 	def getCurrentPage(self):
-		page_data, _ = self.fetcher.get(
-			self.url,
-			params = {
-				"cursor": self.page_cursor,
-				"paginationToken": self.page_cursor or 1, # why is the outfits endpoint like this?? IDK!! ask roblox why their own admins have porn outfits
-				"limit": self.page_size,
-				"sortOrder": self.sort_order.value,
-				**self.extra_params
-			}
-		)
+		page_data = self._fetch_page_data()
+		
+		return self._handle_page_data(page_data)
+	
+	def _get_next_page(self, keep_page: bool = True) -> Page:
+		page_data = self._fetch_page_data()
+		page = self._make_page(self._get_unhandled_data(page_data), keep_page)
+		
+		self._advance()
+		
+		return page
+	
+	def iterPages(self, max_pages: Optional[int] = None, max_items: Optional[int] = None, keep_pages: bool = False, prefetch: int = 0):
+		# streams pages from wherever the iterator currently is, only holding onto one page at a time
+		# unless keep_pages is on, the limits count from when iterating started
+		# prefetch is how many pages get fetched ahead in the background while the current one is being handled
+		item_count = 0
+		
+		if not self._is_within_limits(0, item_count, max_pages, max_items):
+			return
 		
-		self.next_cursor = page_data.get('nextPageCursor', page_data.get('paginationToken'))
+		page_datas = self._fetch_pages(max_pages, prefetch)
+		
+		try:
+			for page_data in page_datas:
+				data = self._take_page_data(page_data, item_count, max_items)
+				
+				item_count += len(data)
+				
+				yield self._make_page(data, keep_pages)
+				
+				# only checkpoint once asked for more, so a crash while a page is being handled means it gets fetched again
+				self._page_handled()
+				
+				if max_items is not None and item_count >= max_items:
+					return
+		finally:
+			page_datas.close()
+	
+	def iterItems(self, max_items: Optional[int] = None, max_pages: Optional[int] = None, keep_pages: bool = False, prefetch: int = 0):
+		for page in self.iterPages(max_pages=max_pages, max_items=max_items, keep_pages=keep_pages, prefetch=prefetch):
+			yield from page.data
+	
+	def _fetch_pages(self, max_pages: Optional[int] = None, prefetch: int = 0):
+		if prefetch > 0:
+			return self._prefetch_pages(max_pages, prefetch)
+		
+		return self._walk_pages(max_pages)
+	
+	def _walk_pages(self, max_pages: Optional[int] = None):
+		# follows the cursors on its own, so it can run ahead of what has been handled so far
+		if self.is_finished:
+			return
+		
+		cursor = self.page_cursor
+		page_count = 0
+		
+		while max_pages is None or page_count < max_pages:
+			page_data = self._fetch_page_data(cursor)
+			page_count += 1
+			
+			yield page_data
+			
+			cursor = get_next_cursor(page_data)
+			
+			if not cursor:
+				return
+	
+	def _prefetch_pages(self, max_pages: Optional[int], prefetch: int):
+		pages = Queue(maxsize=prefetch)
+		stopped = Event()
+		
+		def put(item: Any) -> bool:
+			while not stopped.is_set():
+				try:
+					pages.put(item, timeout=0.1)
+					
+					return True
+				except Full:
+					pass
+			
+			return False
+		
+		def produce():
+			try:
+				for page_data in self._walk_pages(max_pages):
+					if not put((page_data, None)):
+						return
+				
+				put((END_OF_PAGES, None))
+			except Exception as error:
+				put((None, error))
+		
+		Thread(target=produce, daemon=True).start()
+		
+		try:
+			while True:
+				page_data, error = pages.get()
+				
+				if error is not None:
+					raise error
+				
+				if page_data is END_OF_PAGES:
+					return
+				
+				yield page_data
+		finally:
+			# lets the producer finish up if iteration was stopped early
+			stopped.set()
+	
+	def __iter__(self):
+		return self.iterItems()
+	
+	def _is_within_limits(self, page_count: int, item_count: int, max_pages: Optional[int], max_items: Optional[int]) -> bool:
+		if self.is_finished:
+			return False
+		
+		if max_pages is not None and page_count >= max_pages:
+			return False
+		
+		return max_items is None or item_count < max_items
+	
+	def _take_page_data(self, page_data: dict, item_count: int, max_items: Optional[int]) -> list:
+		# a page cut short by max_items isn't moved past, the rest of it is handed out next time
+		data = self._get_unhandled_data(page_data)
+		
+		if max_items is not None and len(data) > max_items - item_count:
+			data = data[:max_items - item_count]
+			self.page_offset += len(data)
+			
+			return data
+		
+		self._advance()
+		
+		return data
+	
+	def _fetch_page_data(self, cursor: Optional[str] = None) -> dict:
+		while True:
+			page_data, response = self.fetcher.get(self.url, params=self._get_params(cursor))
+			
+			if not self._step_down_page_size(page_data, response):
+				return self._check_page_data(page_data, response)
+	
+	def _check_page_data(self, page_data: Any, response: Any) -> dict:
+		# error responses have no data, better to say why here than have the handler trip over None
+		if not isinstance(page_data, dict) or page_data.get('data') is None:
+			errors = page_data.get('errors') if isinstance(page_data, dict) else None
+			
+			raise PageError(self.url, get_status_code(response), errors or [])
+		
+		return page_data
+	
+	def _step_down_page_size(self, page_data: Any, response: Any) -> bool:
+		# roblox answers a limit it doesn't take with a 400, so try again with the next size down. a size that was
+		# asked for only steps down when the error is about the size, any 400 could be a bad cursor or the like
+		if get_status_code(response) != 400:
+			self._negotiating_page_size = False
+			
+			return False
+		
+		if not self._negotiating_page_size and not _is_page_size_error(page_data):
+			return False
+		
+		smaller_sizes = [page_size for page_size in self.allowed_page_sizes if page_size < self.page_size]
+		
+		if not smaller_sizes:
+			return False
+		
+		self.page_size = max(smaller_sizes)
+		
+		return True
+	
+	def _get_params(self, cursor: Optional[str] = None):
+		if cursor is None:
+			cursor = self.page_cursor
+		
+		params = {
+			"cursor": cursor,
+			"paginationToken": cursor or 1, # why is the outfits endpoint like this?? IDK!! ask roblox why their own admins have porn outfits
+			"limit": self.page_size,
+			"sortOrder": self.sort_order.value,
+			**self.extra_params
+		}
+		
+		# the outfits endpoint takes its page size as itemsPerPage, keep it on the size actually in use ('max' or stepped down)
+		if "itemsPerPage" in params:
+			params["itemsPerPage"] = self.page_size
+		
+		return params
+	
+	def getAllColumns(self, fields: dict, page_limit: int = 5, path: Optional[str] = None, prefetch: int = 0):
+		# builds a numpy structured array straight from the json without making any models or caching pages,
+		# with a path the rows get appended to a .npy file instead and a memmap of it is returned
+		builder = get_columnar_builder(fields, path)
+		page_datas = self._fetch_pages(max(page_limit - self.current_page_index, 0), prefetch)
+		
+		try:
+			for page_data in page_datas:
+				builder.add_page(self._get_unhandled_data(page_data))
+				self.advanceToNextPage()
+		finally:
+			page_datas.close()
+			builder.close()
+		
+		return builder.finish()
+	
+	def _handle_cursors(self, page_data: dict) -> list:
+		self.next_cursor = get_next_cursor(page_data)
 		self.prev_cursor = page_data.get('previousPageCursor')
 		
-		data = page_data.get('data')
+		return page_data.get('data')
+	
+	def _get_unhandled_data(self, page_data: dict) -> list:
+		data = self._handle_cursors(page_data)
+		
+		return data[self.page_offset:] if self.page_offset else data
+	
+	def _handle_page_data(self, page_data: dict):
+		return self._make_page(self._handle_cursors(page_data))
+	
+	def _make_page(self, data: list, keep_page: bool = True) -> Page:
+		raw_data = data if self.fetcher.client.config.keep_raw else None
 		
 		if self.handler:
 			data = [
@@ -107,13 +459,18 @@ class PageIterator:
 				) for item_data in data
 			]
 		
-		new_page = Page(data)
+		new_page = Page(data, raw_data)
 		
-		self.cached_pages.append(new_page)
+		if keep_page:
+			self.cached_pages.append(new_page)
 		
 		return new_page
 	
 	def advanceToNextPage(self):
+		self._advance()
+		self._page_handled()
+	
+	def _advance(self):
 		if not self.next_cursor:
 			self.is_finished = True
 			
@@ -124,54 +481,161 @@ class PageIterator:
 		self.prev_cursor = self.page_cursor
 		self.page_cursor = self.next_cursor
 		self.next_cursor = None
+		self.page_offset = 0
 	
 	def __repr__(self) -> str:
 		return f'<{self.__class__.__name__}: {self.url!r}>'
 
 
 class Fetcher:
+	page_iterator_class = PageIterator
+	
 	def __init__(self, client: Client, session: Session = None, xcsrf_token_name: str = 'X-CSRF-Token'):
 		self.client = client
-		self.session = session or Session()
+		self.session = session
+		
+		if session is None:
+			self.session = Session()
+			self.mount_adapters()
 		
 		self.xcsrf_token_name = xcsrf_token_name
+		self._header_lock = Lock()
+		
+		self.in_flight = SingleFlight()
+		self.http_cache = HTTPCache(client.config.http_cache_size) if client.config.http_cache_size > 0 else None
 		
 		self.set_header('Content-Type', 'application/json')
 		self.set_header('User-Agent', 'Roblox/WinInet')
 		self.set_header('Referer', 'https://www.roblox.com/')
 	
+	def mount_adapters(self):
+		client = self.client
+		config = client.config
+		
+		for protocol in ('https://', 'http://'):
+			self.session.mount(protocol, HTTPAdapter(pool_maxsize=config.pool_maxsize, pool_block=config.pool_block))
+		
+		for subdomain, pool_size in config.pool_sizes.items():
+			self.session.mount(
+				client.url_generator.get_url(subdomain),
+				HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=config.pool_block)
+			)
+	
 	def set_header(self, header: str, value: Any):
-		self.session.headers[header] = value
+		# swap in a new mapping instead of mutating the one other threads might be sending with
+		with self._header_lock:
+			headers = CaseInsensitiveDict(self.session.headers)
+			headers[header] = value
+			
+			self.session.headers = headers
 	
 	def set_cookie(self, name: str, value: Any):
 		self.session.cookies[name] = value
 	
-	def request(self, method: str, url: str, params: dict = None, *args, **kwargs) -> tuple[dict, Response]:
+	def wait_for_rate_limit(self, url: str):
+		client = self.client
+		delay = client.config.rate_limiter.reserve(client.url_generator.get_subdomain(url))
+		
+		if delay > 0:
+			sleep(delay)
+	
+	def decode(self, body: bytes) -> Any:
+		return self.client.config.decode_json(body)
+	
+	def _send(self, method: str, url: str, params: dict = None, *args, **kwargs) -> Response:
 		config = self.client.config
-		response = self.session.request(method=method, url=url, params=params, *args, **kwargs)
+		retry_policy = config.retry_policy
 		
-		if config._debug_print_requests:
-			print(f'{method} request: {url} ({response.status_code})')
+		attempt = 0
+		refreshed_xcsrf = False
 		
-		if response.status_code == 429: # too many requests
-			print('too many requests!')
+		while True:
+			self.wait_for_rate_limit(url)
+			retry_policy.budget.deposit()
+			
+			try:
+				response = self.session.request(method=method, url=url, params=params, *args, **kwargs)
+			except RequestsConnectionError as error:
+				if not retry_policy.should_retry(method, attempt, error=error):
+					raise
+				
+				if config._debug_print_requests:
+					print(f'{method} request: {url} ({error.__class__.__name__}), retrying')
+				
+				sleep(retry_policy.get_delay(attempt))
+				attempt += 1
+				
+				continue
+			
+			if config._debug_print_requests:
+				print(f'{method} request: {url} ({response.status_code})')
 			
-			if config.retry_timer > 0:
-				print('retrying request')
+			if response.status_code == 403 and self.xcsrf_token_name in response.headers and not refreshed_xcsrf:
+				self.set_header(self.xcsrf_token_name, response.headers.get(self.xcsrf_token_name))
+				refreshed_xcsrf = True
 				
-				sleep(config.retry_timer)
+				continue
+			
+			if retry_policy.should_retry(method, attempt, status=response.status_code):
+				sleep(retry_policy.get_delay(attempt, response.headers.get('Retry-After')))
+				attempt += 1
 				
-				return self.request(method=method, url=url, params=params, *args, **kwargs)
+				continue
+			
+			return response
+	
+	def request(self, method: str, url: str, params: dict = None, *args, **kwargs) -> tuple[dict, Response]:
+		http_cache = self.http_cache
 		
-		if response.status_code == 403 and self.xcsrf_token_name in response.headers:
-			self.set_header(self.xcsrf_token_name, response.headers.get(self.xcsrf_token_name))
+		if http_cache is None or method != 'GET' or args or kwargs:
+			response = self._send(method, url, params, *args, **kwargs)
 			
-			response = self.session.request(method=method, url=url, params=params, *args, **kwargs)
+			return self.decode(response.content), response
+		
+		cache_key = make_request_key(url, params)
+		entry = http_cache.get(cache_key) if cache_key is not None else None
+		
+		if entry is not None and entry.is_fresh:
+			return entry.data, entry.response
+		
+		response = self._send(method, url, params, headers=entry.get_conditional_headers() if entry else None)
+		
+		if response.status_code == 304 and entry is not None:
+			http_cache.revalidate(cache_key, entry, response.headers)
+			
+			return entry.data, response
+		
+		data = self.decode(response.content)
+		
+		if cache_key is not None and response.status_code == 200:
+			http_cache.store(cache_key, response.headers, data, response)
 		
-		return response.json(), response
+		return data, response
+	
+	def map_chunks(self, items: list, chunk_size: int, get_chunk: Callable[[list], list], key: Optional[Callable] = None) -> list:
+		chunks = chunked(items, chunk_size)
+		
+		if not chunks:
+			return []
+		
+		if len(chunks) == 1:
+			return order_results(get_chunk(chunks[0]), items, key)
+		
+		with ThreadPoolExecutor(max_workers=min(self.client.config.max_chunk_workers, len(chunks))) as executor:
+			results = [result for chunk_results in executor.map(get_chunk, chunks) for result in chunk_results]
+		
+		return order_results(results, items, key)
 	
 	def get(self, url: str, params: dict = None, *args, **kwargs) -> tuple[dict, Response]:
-		return self.request(method="GET", url=url, params=params, *args, **kwargs)
+		key = None
+		
+		if self.client.config.coalesce_requests and not args and not kwargs:
+			key = make_request_key(url, params)
+		
+		if key is None:
+			return self.request(method="GET", url=url, params=params, *args, **kwargs)
+		
+		return self.in_flight.do(key, lambda: self.request(method="GET", url=url, params=params))
 	
 	def post(self, url: str, payload: dict = None, *args, **kwargs) -> tuple[dict, Response]:
 		return self.request(method="POST", url=url, json=payload, *args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,112 @@
+from __future__ import annotations
+from typing import Any, Hashable, Mapping, Optional
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+def parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+	directives = {}
+	
+	if not value:
+		return directives
+	
+	for directive in value.split(','):
+		name, _, argument = directive.strip().partition('=')
+		
+		if name:
+			directives[name.lower()] = argument.strip('"') or None
+	
+	return directives
+
+def get_max_age(headers: Mapping[str, str]) -> float:
+	directives = parse_cache_control(headers.get('Cache-Control'))
+	
+	if 'no-cache' in directives:
+		return 0
+	
+	try:
+		max_age = float(directives.get('max-age') or 0)
+		age = float(headers.get('Age') or 0)
+	except ValueError:
+		return 0
+	
+	return max(max_age - age, 0)
+
+class CacheEntry:
+	def __init__(self, data: Any, response: Any, etag: Optional[str], last_modified: Optional[str], max_age: float) -> None:
+		self.data = data
+		self.response = response
+		
+		self.etag = etag
+		self.last_modified = last_modified
+		
+		self.expires = monotonic() + max_age
+	
+	@property
+	def is_fresh(self):
+		return monotonic() < self.expires
+	
+	def get_conditional_headers(self) -> dict[str, str]:
+		headers = {}
+		
+		if self.etag:
+			headers['If-None-Match'] = self.etag
+		
+		if self.last_modified:
+			headers['If-Modified-Since'] = self.last_modified
+		
+		return headers
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.etag or self.last_modified!r}>'
+
+class HTTPCache:
+	def __init__(self, max_entries: int = 1024) -> None:
+		self.max_entries = max_entries
+		
+		self.entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+		
+		self._lock = Lock()
+	
+	def get(self, key: Hashable) -> Optional[CacheEntry]:
+		with self._lock:
+			entry = self.entries.get(key)
+			
+			if entry is not None:
+				self.entries.move_to_end(key)
+			
+			return entry
+	
+	def store(self, key: Hashable, headers: Mapping[str, str], data: Any, response: Any):
+		if 'no-store' in parse_cache_control(headers.get('Cache-Control')):
+			return
+		
+		etag = headers.get('ETag')
+		last_modified = headers.get('Last-Modified')
+		max_age = get_max_age(headers)
+		
+		if not etag and not last_modified and max_age <= 0:
+			return # nothing we could ever reuse this for
+		
+		with self._lock:
+			self.entries[key] = CacheEntry(data, response, etag, last_modified, max_age)
+			self.entries.move_to_end(key)
+			
+			while len(self.entries) > self.max_entries:
+				self.entries.popitem(last=False)
+	
+	def revalidate(self, key: Hashable, entry: CacheEntry, headers: Mapping[str, str]):
+		# a 304 can hand out new validators and a new max-age for the body we already have
+		self.store(key, {
+			'ETag': headers.get('ETag') or entry.etag,
+			'Last-Modified': headers.get('Last-Modified') or entry.last_modified,
+			'Cache-Control': headers.get('Cache-Control'),
+			'Age': headers.get('Age')
+		}, entry.data, entry.response)
+	
+	def clear(self):
+		with self._lock:
+			self.entries.clear()
+	
+	def __len__(self) -> int:
+		return len(self.entries)
\ No newline at end of file
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import Iterable
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+# new ids wait in a plain set until there's this many of them (or an eighth of the merged ones, whichever is bigger)
+ID_BUFFER_SIZE = 4096
+
+class IdSet:
+	# a set of ids that costs 8 bytes each instead of the ~70 a python set of ints does,
+	# most of them live in a sorted array and new ones sit in a small set until they get merged in
+	__slots__ = ('ids', 'buffer')
+	
+	def __init__(self, ids: Iterable[int] = ()) -> None:
+		self.ids = array('q')
+		self.buffer = set()
+		
+		self.update(ids)
+	
+	@classmethod
+	def from_sorted(cls, ids: Iterable[int]):
+		# for ids that are already sorted and unique (like a saved IdSet), skips checking them one at a time
+		id_set = cls()
+		id_set.ids = array('q', ids)
+		
+		return id_set
+	
+	def add(self, id: int) -> bool:
+		# returns whether the id is new
+		if id in self:
+			return False
+		
+		buffer = self.buffer
+		buffer.add(id)
+		
+		if len(buffer) >= max(ID_BUFFER_SIZE, len(self.ids) >> 3):
+			self._merge()
+		
+		return True
+	
+	def update(self, ids: Iterable[int]):
+		for id in ids:
+			self.add(id)
+	
+	def _merge(self):
+		# the merged ids are copied over in slices between where each new one goes, so only the new ones
+		# get touched from python and the peak is just the two arrays
+		ids = self.ids
+		merged = array('q')
+		start = 0
+		
+		for id in sorted(self.buffer):
+			index = bisect_left(ids, id, start)
+			
+			merged += ids[start:index]
+			merged.append(id)
+			
+			start = index
+		
+		merged += ids[start:]
+		
+		self.ids = merged
+		self.buffer = set()
+	
+	def __contains__(self, id: int) -> bool:
+		if id in self.buffer:
+			return True
+		
+		ids = self.ids
+		index = bisect_left(ids, id)
+		
+		return index < len(ids) and ids[index] == id
+	
+	def __len__(self) -> int:
+		return len(self.ids) + len(self.buffer)
+	
+	def __iter__(self):
+		return merge(self.ids, sorted(self.buffer))
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {len(self)} ids>'
\ No newline at end of file
@@ -0,0 +1,30 @@
+from __future__ import annotations
+import re
+
+# pass this as a PageIterator's page_size to use the biggest limit its endpoint takes
+MAX_PAGE_SIZE = 'max'
+
+# what roblox's cursor endpoints usually take when they aren't in the table below
+DEFAULT_PAGE_SIZES = (10, 25, 50, 100)
+
+# the limit values each endpoint accepts, matched against the end of the url,
+# add to this if an endpoint you're walking takes something else
+PAGE_SIZES = [
+	(r'v1/groups/\d+/users', (10, 25, 50, 100)),
+	(r'v1/users/\d+/badges', (10, 25, 50, 100)),
+	(r'v1/universes/\d+/badges', (10, 25, 50, 100)),
+	(r'v1/games/\d+/servers/\d+', (10, 25, 50, 100)),
+	(r'v2/users/\d+/inventory/\d+', (10, 25, 50, 100)),
+	(r'v2/users/\d+/games', (10, 25, 50)),
+	(r'v2/avatar/users/\d+/outfits', (10, 25, 50)),
+	(r'v1/my/friends/requests', (10, 18, 25, 50, 100))
+]
+
+def get_allowed_page_sizes(url: str) -> tuple[int]:
+	path = url.split('?', 1)[0].rstrip('/')
+	
+	for pattern, page_sizes in PAGE_SIZES:
+		if re.search(f'(^|/){pattern}$', path):
+			return page_sizes
+	
+	return DEFAULT_PAGE_SIZES
\ No newline at end of file
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Any, Optional
+from threading import local
+from time import time
+import json
+import sqlite3
+
+# expired rows get cleared out when the cache is opened and again every this many sets
+PURGE_INTERVAL = 1000
+
+class SQLiteCache:
+	def __init__(self, path: str, timeout: float = 30) -> None:
+		self.path = path
+		self.timeout = timeout
+		
+		# sqlite connections can't be shared between threads, so every thread gets its own
+		self._local = local()
+		
+		self._connect().execute(
+			'CREATE TABLE IF NOT EXISTS cache ('
+			'name TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires REAL, '
+			'PRIMARY KEY (name, key))'
+		)
+		
+		self._sets = 0
+		
+		self.purge_expired()
+	
+	def _connect(self) -> sqlite3.Connection:
+		connection = getattr(self._local, 'connection', None)
+		
+		if connection is None:
+			connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+			
+			# WAL lets several processes read while one of them writes
+			connection.execute('PRAGMA journal_mode=WAL')
+			connection.execute('PRAGMA synchronous=NORMAL')
+			
+			self._local.connection = connection
+		
+		return connection
+	
+	def get_entry(self, name: str, key: Any) -> Optional[tuple[Any, Optional[float]]]:
+		# the value and the unix time it expires at (None for never), or None if it isn't there
+		row = self._connect().execute(
+			'SELECT value, expires FROM cache WHERE name = ? AND key = ?',
+			(name, str(key))
+		).fetchone()
+		
+		if row is None:
+			return
+		
+		value, expires = row
+		
+		if expires is not None and expires < time():
+			return
+		
+		return json.loads(value), expires
+	
+	def get(self, name: str, key: Any) -> Optional[Any]:
+		entry = self.get_entry(name, key)
+		
+		return entry[0] if entry is not None else None
+	
+	def set(self, name: str, key: Any, value: Any, ttl: Optional[float] = None):
+		self._connect().execute(
+			'INSERT OR REPLACE INTO cache (name, key, value, expires) VALUES (?, ?, ?, ?)',
+			(name, str(key), json.dumps(value), time() + ttl if ttl is not None else None)
+		)
+		
+		self._sets += 1
+		
+		if self._sets % PURGE_INTERVAL == 0:
+			self.purge_expired()
+	
+	def delete(self, name: str, key: Any):
+		self._connect().execute('DELETE FROM cache WHERE name = ? AND key = ?', (name, str(key)))
+	
+	def purge_expired(self):
+		self._connect().execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?', (time(),))
+	
+	def close(self):
+		connection = getattr(self._local, 'connection', None)
+		
+		if connection is not None:
+			connection.close()
+			
+			self._local.connection = None
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.path!r}>'
\ No newline at end of file
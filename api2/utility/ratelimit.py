@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import Optional
+from threading import Lock
+from time import monotonic
+
+class RateLimit:
+	def __init__(self, requests: float, per: float = 60, burst: Optional[int] = None) -> None:
+		if requests <= 0 or per <= 0:
+			raise ValueError('RateLimit requests and period have to be positive!')
+		
+		self.requests = requests
+		self.per = per
+		self.burst = burst or max(int(requests), 1)
+	
+	@property
+	def rate(self):
+		return self.requests / self.per
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.requests}/{self.per}s>'
+
+class TokenBucket:
+	def __init__(self, limit: RateLimit) -> None:
+		self.limit = limit
+		
+		self.tokens = float(limit.burst)
+		self.updated = monotonic()
+		
+		self._lock = Lock()
+	
+	def _refill(self, now: float):
+		limit = self.limit
+		
+		self.tokens = min(limit.burst, self.tokens + (now - self.updated) * limit.rate)
+		self.updated = now
+	
+	def reserve(self) -> float:
+		# takes a token straight away and returns how long the caller has to wait before using it,
+		# going into debt means callers queue up behind each other instead of all waking up at once
+		with self._lock:
+			self._refill(monotonic())
+			
+			self.tokens -= 1
+			
+			if self.tokens >= 0:
+				return 0
+			
+			return -self.tokens / self.limit.rate
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.tokens:.2f}/{self.limit.burst}>'
+
+class RateLimiter:
+	def __init__(self, limits: Optional[dict[str, RateLimit]] = None, default_limit: Optional[RateLimit] = None) -> None:
+		self.limits = limits or {}
+		self.default_limit = default_limit
+		
+		self.buckets: dict[str, TokenBucket] = {}
+		
+		self._lock = Lock()
+	
+	def get_bucket(self, key: str) -> Optional[TokenBucket]:
+		bucket = self.buckets.get(key)
+		
+		if bucket is not None:
+			return bucket
+		
+		limit = self.limits.get(key, self.default_limit)
+		
+		if limit is None:
+			return
+		
+		with self._lock:
+			return self.buckets.setdefault(key, TokenBucket(limit))
+	
+	def reserve(self, key: str) -> float:
+		bucket = self.get_bucket(key)
+		
+		if bucket is None:
+			return 0
+		
+		return bucket.reserve()
\ No newline at end of file
@@ -0,0 +1,106 @@
+from __future__ import annotations
+from typing import Optional
+from threading import Lock
+from random import uniform
+from time import time
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+	if not value:
+		return
+	
+	try:
+		return max(float(value), 0)
+	except ValueError:
+		pass
+	
+	try:
+		return max(parsedate_to_datetime(value).timestamp() - time(), 0)
+	except (TypeError, ValueError):
+		return
+
+class RetryBudget:
+	def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100) -> None:
+		# every request adds `ratio` tokens and every retry costs one, so retries can never add
+		# more than `ratio` extra load on top of normal traffic (plus a small reserve for quiet periods)
+		self.ratio = ratio
+		self.min_tokens = min_tokens
+		self.max_tokens = max_tokens
+		
+		self.tokens = float(min_tokens)
+		
+		self._lock = Lock()
+	
+	def deposit(self):
+		with self._lock:
+			self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+	
+	def withdraw(self) -> bool:
+		with self._lock:
+			if self.tokens < 1:
+				return False
+			
+			self.tokens -= 1
+			
+			return True
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.tokens:.1f}>'
+
+class RetryPolicy:
+	def __init__(self,
+			max_retries: int = 5,
+			base_delay: float = 0.5,
+			max_delay: float = 60,
+			backoff_factor: float = 2,
+			jitter: bool = True,
+			retry_statuses: tuple[int] = (429, 500, 502, 503, 504),
+			non_idempotent_statuses: tuple[int] = (429,),
+			retry_connection_errors: bool = True,
+			budget: Optional[RetryBudget] = None
+		):
+		
+		self.max_retries = max_retries
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		self.backoff_factor = backoff_factor
+		self.jitter = jitter
+		
+		self.retry_statuses = frozenset(retry_statuses)
+		# a POST that failed with a 5xx might have gone through already, a 429 definitely didn't
+		self.non_idempotent_statuses = frozenset(non_idempotent_statuses)
+		self.retry_connection_errors = retry_connection_errors
+		
+		self.budget = budget or RetryBudget()
+	
+	def should_retry(self, method: str, attempt: int, status: Optional[int] = None, error: Optional[Exception] = None) -> bool:
+		if attempt >= self.max_retries:
+			return False
+		
+		is_idempotent = method.upper() in IDEMPOTENT_METHODS
+		
+		if error is not None:
+			if not self.retry_connection_errors or not is_idempotent:
+				return False
+		elif status not in (self.retry_statuses if is_idempotent else self.non_idempotent_statuses):
+			return False
+		
+		return self.budget.withdraw()
+	
+	def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+		delay = min(self.max_delay, self.base_delay * self.backoff_factor ** attempt)
+		
+		if self.jitter:
+			delay = uniform(0, delay)
+		
+		server_delay = parse_retry_after(retry_after)
+		
+		if server_delay is not None:
+			delay = max(delay, min(server_delay, self.max_delay))
+		
+		return delay
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {self.max_retries} retries>'
\ No newline at end of file
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from time import sleep
+import asyncio
+
+from .ratelimit import RateLimit, TokenBucket
+
+if TYPE_CHECKING:
+	from .fetcher import Page, PageIterator
+
+class PageScheduler:
+	# walks lots of PageIterators at once and yields (source, page) as pages come in,
+	# each iterator only has one request out at a time (cursors have to be followed in order) and goes to the back
+	# of the queue once its page is in, so a few huge cursors can't starve everything else
+	def __init__(
+			self,
+			iterators: Union[Iterable[PageIterator], dict[Any, PageIterator]],
+			max_workers: int = 8,
+			rate_limit: Optional[RateLimit] = None,
+			max_pages: Optional[int] = None,
+			keep_pages: bool = False,
+			skip_errors: bool = False
+		) -> None:
+		
+		# with a dict the keys are yielded as the source, otherwise it's the iterator itself
+		if isinstance(iterators, dict):
+			self.sources = list(iterators.items())
+		else:
+			self.sources = [(iterator, iterator) for iterator in iterators]
+		
+		self.max_workers = max_workers
+		self.bucket = TokenBucket(rate_limit) if rate_limit else None
+		
+		# max_pages is per iterator
+		self.max_pages = max_pages
+		self.keep_pages = keep_pages
+		
+		# with skip_errors on an iterator that fails gets dropped and its error is kept here instead of being raised
+		self.skip_errors = skip_errors
+		self.errors: dict[Any, Exception] = {}
+		
+		self.page_counts: dict[PageIterator, int] = {}
+	
+	def _is_done(self, iterator: PageIterator) -> bool:
+		if iterator.is_finished:
+			return True
+		
+		return self.max_pages is not None and self.page_counts.get(iterator, 0) >= self.max_pages
+	
+	def _get_delay(self) -> float:
+		return self.bucket.reserve() if self.bucket else 0
+	
+	def _fetch_page(self, iterator: PageIterator) -> Page:
+		delay = self._get_delay()
+		
+		if delay > 0:
+			sleep(delay)
+		
+		return iterator._get_next_page(self.keep_pages)
+	
+	async def _fetch_page_async(self, iterator: PageIterator) -> Page:
+		delay = self._get_delay()
+		
+		if delay > 0:
+			await asyncio.sleep(delay)
+		
+		return await iterator._get_next_page(self.keep_pages)
+	
+	def _handle_result(self, ready: deque, source: Any, iterator: PageIterator, get_page) -> Optional[Page]:
+		try:
+			page = get_page()
+		except Exception as error:
+			if not self.skip_errors:
+				raise
+			
+			self.errors[source] = error
+			
+			return
+		
+		self.page_counts[iterator] = self.page_counts.get(iterator, 0) + 1
+		ready.append((source, iterator))
+		
+		return page
+	
+	def __iter__(self):
+		ready = deque(self.sources)
+		in_flight = {}
+		
+		executor = ThreadPoolExecutor(max_workers=self.max_workers)
+		
+		try:
+			while ready or in_flight:
+				while ready and len(in_flight) < self.max_workers:
+					source, iterator = ready.popleft()
+					
+					if not self._is_done(iterator):
+						in_flight[executor.submit(self._fetch_page, iterator)] = (source, iterator)
+				
+				if not in_flight:
+					continue
+				
+				done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+				
+				for future in done:
+					source, iterator = in_flight.pop(future)
+					page = self._handle_result(ready, source, iterator, future.result)
+					
+					if page is not None:
+						yield source, page
+						
+						iterator._page_handled()
+		finally:
+			executor.shutdown(wait=False, cancel_futures=True)
+	
+	async def __aiter__(self):
+		ready = deque(self.sources)
+		in_flight = {}
+		
+		try:
+			while ready or in_flight:
+				while ready and len(in_flight) < self.max_workers:
+					source, iterator = ready.popleft()
+					
+					if not self._is_done(iterator):
+						in_flight[asyncio.ensure_future(self._fetch_page_async(iterator))] = (source, iterator)
+				
+				if not in_flight:
+					continue
+				
+				done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+				
+				for task in done:
+					source, iterator = in_flight.pop(task)
+					page = self._handle_result(ready, source, iterator, task.result)
+					
+					if page is not None:
+						yield source, page
+						
+						iterator._page_handled()
+		finally:
+			for task in in_flight:
+				task.cancel()
+	
+	def __repr__(self) -> str:
+		return f'<{self.__class__.__name__}: {len(self.sources)} iterators>'
\ No newline at end of file
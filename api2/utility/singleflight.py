@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Any, Callable, Hashable, Optional
+from threading import Lock, Event
+from asyncio import Task, shield, ensure_future
+from functools import partial
+
+def make_request_key(url: str, params: Optional[dict] = None) -> Optional[Hashable]:
+	if not params:
+		return (url,)
+	
+	items = []
+	
+	for key, value in params.items():
+		if isinstance(value, (list, tuple)):
+			value = tuple(value)
+		
+		items.append((key, value))
+	
+	key = (url, tuple(sorted(items, key=lambda item: item[0])))
+	
+	try:
+		hash(key)
+	except TypeError: # something in the params can't be used as a key, just don't coalesce it
+		return
+	
+	return key
+
+class _Call:
+	def __init__(self) -> None:
+		self.event = Event()
+		
+		self.result = None
+		self.error = None
+
+class SingleFlight:
+	def __init__(self) -> None:
+		self.calls: dict[Hashable, _Call] = {}
+		
+		self._lock = Lock()
+	
+	def do(self, key: Hashable, func: Callable[[], Any]):
+		with self._lock:
+			call = self.calls.get(key)
+			is_leader = call is None
+			
+			if is_leader:
+				call = self.calls[key] = _Call()
+		
+		if not is_leader:
+			call.event.wait()
+			
+			if call.error is not None:
+				raise call.error
+			
+			return call.result
+		
+		try:
+			call.result = func()
+		except BaseException as error:
+			call.error = error
+			
+			raise
+		finally:
+			with self._lock:
+				del self.calls[key]
+			
+			call.event.set()
+		
+		return call.result
+
+class AsyncSingleFlight:
+	def __init__(self) -> None:
+		self.calls: dict[Hashable, Task] = {}
+	
+	def _finish(self, key: Hashable, task: Task):
+		del self.calls[key]
+		
+		# mark the exception as retrieved in case everyone waiting on it got cancelled
+		if not task.cancelled():
+			task.exception()
+	
+	async def do(self, key: Hashable, func: Callable[[], Any]):
+		task = self.calls.get(key)
+		
+		if task is None:
+			# the call runs in its own task so cancelling whoever started it doesn't cancel it for everyone else
+			task = self.calls[key] = ensure_future(func())
+			task.add_done_callback(partial(self._finish, key))
+		
+		# shielded so one caller getting cancelled doesn't cancel everyone else
+		return await shield(task)
\ No newline at end of file
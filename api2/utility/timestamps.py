@@ -0,0 +1,60 @@
+from __future__ import annotations
+from datetime import date
+from functools import lru_cache
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@lru_cache(maxsize=4096)
+def _get_day_start(date_string: str) -> int:
+	# lots of timestamps in one response share a day, so the calendar maths only gets done once per day
+	return (date.fromisoformat(date_string).toordinal() - EPOCH_ORDINAL) * 86400
+
+def _parse_fallback(value: str) -> float:
+	# dateutil only gets imported the first time roblox sends something unusual
+	from dateutil.parser import parse
+	
+	return parse(value).timestamp()
+
+def parse_timestamp(value: str) -> float:
+	# handles the layouts roblox actually sends, 2019-01-04T20:11:02Z with 0-7 fractional digits and a Z or +00:00 offset,
+	# everything else (and anything invalid) goes through dateutil so the result always matches what it would give
+	if not isinstance(value, str) or len(value) < 20 or value[10] != 'T' or value[4] != '-' or value[7] != '-':
+		return _parse_fallback(value)
+	
+	try:
+		if value[-1] == 'Z':
+			offset = 0
+			end = -1
+		elif value[-6] in '+-' and value[-3] == ':':
+			offset = int(value[-5:-3]) * 3600 + int(value[-2:]) * 60
+			offset = -offset if value[-6] == '-' else offset
+			end = -6
+		else: # no timezone means local time
+			return _parse_fallback(value)
+		
+		if value[13] != ':' or value[16] != ':':
+			return _parse_fallback(value)
+		
+		hour = int(value[11:13])
+		minute = int(value[14:16])
+		second = int(value[17:19])
+		
+		if hour > 23 or minute > 59 or second > 59:
+			return _parse_fallback(value)
+		
+		fraction = value[19:end]
+		microseconds = 0
+		
+		if fraction:
+			if fraction[0] != '.' or not fraction[1:].isdigit():
+				return _parse_fallback(value)
+			
+			# anything past microseconds gets cut off, same as datetime
+			microseconds = int(fraction[1:7].ljust(6, '0'))
+		
+		seconds = _get_day_start(value[:10]) + hour * 3600 + minute * 60 + second - offset
+	except ValueError:
+		return _parse_fallback(value)
+	
+	# divide the same way timedelta.total_seconds does so the floats come out identical to dateutil's
+	return (seconds * 1000000 + microseconds) / 10**6
\ No newline at end of file
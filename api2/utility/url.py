@@ -1,3 +1,5 @@
+from urllib.parse import urlsplit
+
 base_site = 'roblox.com'
 
 class URLGenerator:
@@ -5,4 +7,13 @@ class URLGenerator:
 		self.base_url = base_url
 	
 	def get_url(self, subdomain: str, path: str = '', protocol: str = 'https'):
-		return f'{protocol}://{subdomain}.{self.base_url}/{path}'
\ No newline at end of file
+		return f'{protocol}://{subdomain}.{self.base_url}/{path}'
+	
+	def get_subdomain(self, url: str):
+		host = urlsplit(url).hostname or ''
+		suffix = f'.{self.base_url}'
+		
+		if host.endswith(suffix):
+			return host[:-len(suffix)]
+		
+		return host
\ No newline at end of file
@@ -0,0 +1,102 @@
+# compares the json decoders api2 can use on payloads shaped like the ones roblox sends back
+# usage (from the repo root): python -m benchmarks.bench_json
+
+import json
+from timeit import timeit
+
+from api2.utility.decoding import DECODERS
+
+def make_user(index: int) -> dict:
+	return {
+		'id': 100000000 + index,
+		'name': f'user_{index}',
+		'displayName': f'User {index}',
+		'description': 'just a regular roblox user, nothing to see here ' * 2,
+		'created': '2016-05-21T17:48:03.253Z',
+		'isBanned': False,
+		'externalAppDisplayName': None,
+		'hasVerifiedBadge': False,
+		'isOnline': index % 3 == 0,
+		'presenceType': index % 4,
+		'isDeleted': False,
+		'friendFrequentScore': 0,
+		'friendFrequentRank': 1
+	}
+
+def make_universe(index: int) -> dict:
+	return {
+		'id': 2000000000 + index,
+		'rootPlaceId': 4000000000 + index,
+		'name': f'Experience {index}',
+		'description': 'Welcome to the experience! Join the group for perks. ' * 10,
+		'sourceName': None,
+		'sourceDescription': None,
+		'creator': {'id': 1000 + index, 'name': 'Creator', 'type': 'Group', 'isRNVAccount': False, 'hasVerifiedBadge': True},
+		'price': None,
+		'allowedGearGenres': ['All'],
+		'allowedGearCategories': [],
+		'isGenreEnforced': False,
+		'copyingAllowed': False,
+		'playing': 12345 + index,
+		'visits': 987654321 + index,
+		'maxPlayers': 30,
+		'created': '2019-01-04T20:11:02.18Z',
+		'updated': '2024-08-30T14:25:13.7733333Z',
+		'studioAccessToApisAllowed': True,
+		'createVipServersAllowed': False,
+		'universeAvatarType': 'MorphToR15',
+		'genre': 'All',
+		'isAllGenre': True,
+		'isFavoritedByUser': False,
+		'favoritedCount': 123456
+	}
+
+def make_server(index: int) -> dict:
+	return {
+		'id': f'5c3e2f1a-1b2c-4d5e-8f90-{index:012d}',
+		'maxPlayers': 30,
+		'playing': 28,
+		'playerTokens': [f'{index:08X}' * 4 for _ in range(28)],
+		'players': [],
+		'fps': 59.98,
+		'ping': 87
+	}
+
+def make_member(index: int) -> dict:
+	return {
+		'user': {'buildersClubMembershipType': 'None', 'hasVerifiedBadge': False, 'userId': 100000000 + index, 'username': f'member_{index}', 'displayName': f'Member {index}'},
+		'role': {'id': 12345678, 'name': 'Member', 'rank': 1}
+	}
+
+PAYLOADS = {
+	'friends list (200)': {'data': [make_user(index) for index in range(200)]},
+	'group members page (100)': {'previousPageCursor': None, 'nextPageCursor': 'eyJzdGFydEluZGV4IjoxMDB9', 'data': [make_member(index) for index in range(100)]},
+	'universe multiget (50)': {'data': [make_universe(index) for index in range(50)]},
+	'server list page (100)': {'previousPageCursor': None, 'nextPageCursor': 'eyJzdGFydEluZGV4IjoxMDB9', 'data': [make_server(index) for index in range(100)]}
+}
+
+def main():
+	decoders = {}
+	
+	for name, get_decoder in DECODERS.items():
+		try:
+			decoders[name] = get_decoder()
+		except ImportError:
+			print(f'{name}: not installed, skipping')
+	
+	for payload_name, payload in PAYLOADS.items():
+		body = json.dumps(payload).encode()
+		
+		print(f'\n{payload_name}, {len(body) / 1024:.1f} KiB')
+		
+		baseline = None
+		
+		for name, decode in reversed(decoders.items()):
+			number = 200
+			seconds = timeit(lambda: decode(body), number=number) / number
+			baseline = baseline or seconds
+			
+			print(f'  {name:<8} {seconds * 1e6:>9.1f} us/decode  {baseline / seconds:>5.2f}x')
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
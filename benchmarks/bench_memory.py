@@ -0,0 +1,58 @@
+# measures how many bytes each model takes up once built from a decoded response, including its raw data
+# usage (from the repo root): python -m benchmarks.bench_memory
+
+import gc
+import json
+import tracemalloc
+
+from api2 import Client, ClientConfig
+from api2.classes.users import Friend
+from api2.classes.groups import GroupMember
+from api2.classes.universes import Universe
+
+from benchmarks.bench_json import make_user, make_universe, make_member
+
+OBJECT_COUNT = 20000
+
+MODELS = {
+	'Friend': (lambda client, data: Friend(client, data), make_user),
+	'GroupMember': (lambda client, data: GroupMember(client, data, None), make_member),
+	'Universe': (lambda client, data: Universe(client, data), make_universe)
+}
+
+CONFIGS = {
+	'default': {},
+	'lazy_models': {'lazy_models': True},
+	'keep_raw off': {'keep_raw': False}
+}
+
+def measure(client: Client, build, make_data) -> float:
+	# decode the data like a real response would, so every object gets its own dicts
+	body = json.dumps([make_data(index) for index in range(OBJECT_COUNT)])
+	
+	gc.collect()
+	tracemalloc.start()
+	
+	models = [build(client, data) for data in json.loads(body)]
+	
+	gc.collect()
+	size, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	
+	del models
+	
+	return size / OBJECT_COUNT
+
+def main():
+	print(f'{OBJECT_COUNT} objects each, bytes per object')
+	
+	for model_name, (build, make_data) in MODELS.items():
+		print(f'\n{model_name}')
+		
+		for config_name, options in CONFIGS.items():
+			client = Client(config=ClientConfig(**options))
+			
+			print(f'  {config_name:<14} {measure(client, build, make_data):>8.0f}')
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
@@ -0,0 +1,37 @@
+# compares api2's timestamp parser against dateutil on a million timestamps in the layouts roblox sends
+# usage (from the repo root): python -m benchmarks.bench_timestamps
+
+import random
+from time import perf_counter
+
+from dateutil.parser import parse
+
+from api2.utility.timestamps import parse_timestamp
+
+TIMESTAMP_COUNT = 1_000_000
+
+def make_timestamp(rng: random.Random) -> str:
+	fraction = rng.choice(['', '.18', '.253', '.7733333'])
+	
+	return f'{rng.randint(2006, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}{fraction}Z'
+
+def main():
+	rng = random.Random(0)
+	timestamps = [make_timestamp(rng) for _ in range(TIMESTAMP_COUNT)]
+	
+	start = perf_counter()
+	fast = [parse_timestamp(timestamp) for timestamp in timestamps]
+	fast_seconds = perf_counter() - start
+	
+	start = perf_counter()
+	slow = [parse(timestamp).timestamp() for timestamp in timestamps]
+	slow_seconds = perf_counter() - start
+	
+	assert fast == slow, 'parse_timestamp disagrees with dateutil'
+	
+	print(f'{TIMESTAMP_COUNT} timestamps')
+	print(f'  dateutil        {slow_seconds:>6.2f} s  {slow_seconds / TIMESTAMP_COUNT * 1e6:>6.2f} us/timestamp')
+	print(f'  parse_timestamp {fast_seconds:>6.2f} s  {fast_seconds / TIMESTAMP_COUNT * 1e6:>6.2f} us/timestamp  {slow_seconds / fast_seconds:>5.1f}x')
+
+if __name__ == '__main__':
+	main()
\ No newline at end of file
@@ -11,7 +11,12 @@ setup_info = {
 	'install_requires': [
 		'requests>=2.25.1',
 		'python-dateutil>=2.8.0'
-	]
+	],
+	'extras_require': {
+		'async': ['aiohttp>=3.8.0'],
+		'fast': ['orjson>=3.6.0'],
+		'numpy': ['numpy>=1.20.0']
+	}
 }
 
 setuptools.setup(**setup_info)
\ No newline at end of file